@@ -11,6 +11,9 @@ import * as logs from 'aws-cdk-lib/aws-logs';
 import { PythonFunction } from '@aws-cdk/aws-lambda-python-alpha';
 import { Construct } from 'constructs';
 import * as path from 'path';
+import { execFileSync } from 'child_process';
+import { createHash } from 'crypto';
+import { readFileSync } from 'fs';
 import { fileURLToPath } from 'url';
 import { dirname } from 'path';
 import { NagSuppressions } from 'cdk-nag';
@@ -37,8 +40,45 @@ export class AdoptaiStack extends cdk.Stack {
       enforceSSL: true,
     });
 
+    const dataDir = path.join(__dirname, '../../data');
+    const lambdaDir = path.join(__dirname, 'lambda');
+
+    // Compiled *.snapshot.json files (pre-parsed times + search index) loaded by
+    // the handler at init. Built locally when Python is available, in Docker otherwise.
+    // The asset hash covers the compiler and the handler code it runs, not only
+    // data/, so a format or index change rebuilds the snapshots.
+    const snapshotHash = createHash('sha256')
+      .update(cdk.FileSystem.fingerprint(dataDir))
+      .update(readFileSync(path.join(lambdaDir, 'handler.py')))
+      .update(readFileSync(path.join(lambdaDir, 'compile_snapshot.py')))
+      .digest('hex');
+    const snapshotSource = s3deploy.Source.asset(dataDir, {
+      assetHash: snapshotHash,
+      bundling: {
+        image: lambda.Runtime.PYTHON_3_14.bundlingImage,
+        volumes: [{ hostPath: lambdaDir, containerPath: '/lambda' }],
+        command: ['bash', '-c', [
+          'pip install -q --target /tmp/deps boto3',
+          'PYTHONPATH=/tmp/deps python /lambda/compile_snapshot.py /asset-input /asset-output',
+        ].join(' && ')],
+        local: {
+          tryBundle(outputDir: string) {
+            try {
+              execFileSync('python3', [path.join(lambdaDir, 'compile_snapshot.py'), dataDir, outputDir], {
+                cwd: lambdaDir,
+                stdio: 'inherit',
+              });
+              return true;
+            } catch {
+              return false;
+            }
+          },
+        },
+      },
+    });
+
     const dataDeployment = new s3deploy.BucketDeployment(this, 'AdoptaiDataDeployment', {
-      sources: [s3deploy.Source.asset(path.join(__dirname, '../../data'))],
+      sources: [s3deploy.Source.asset(dataDir), snapshotSource],
       destinationBucket: dataBucket,
       destinationKeyPrefix: 'data',
     });
@@ -61,6 +101,7 @@ export class AdoptaiStack extends cdk.Stack {
       environment: {
         BUCKET_NAME: dataBucket.bucketName,
         DATA_PREFIX: 'data',
+        DATA_REFRESH_SECONDS: '30',
         POWERTOOLS_SERVICE_NAME: 'adoptai-api',
         POWERTOOLS_LOG_LEVEL: 'INFO',
       },
@@ -88,6 +129,30 @@ export class AdoptaiStack extends cdk.Stack {
       },
     });
 
+    // Cache at the edge keyed on the full query string and the Accept header
+    // (JSON, MessagePack or CBOR bodies). TTLs come from the Cache-Control
+    // headers set by the handler; responses without one are not cached.
+    // Accept is first reduced to the negotiated media type by a viewer-request
+    // function, so it adds at most one cache entry per body format.
+    const normalizeAccept = new cloudfront.Function(this, 'AdoptaiNormalizeAccept', {
+      code: cloudfront.FunctionCode.fromFile({
+        filePath: path.join(__dirname, 'cloudfront', 'normalize-accept.js'),
+      }),
+      runtime: cloudfront.FunctionRuntime.JS_2_0,
+      comment: 'Reduce Accept to application/json, msgpack or cbor',
+    });
+    const apiCachePolicy = new cloudfront.CachePolicy(this, 'AdoptaiApiCachePolicy', {
+      comment: 'AdoptAI API: query-string and Accept keyed, origin Cache-Control driven',
+      defaultTtl: cdk.Duration.seconds(0),
+      minTtl: cdk.Duration.seconds(0),
+      maxTtl: cdk.Duration.days(1),
+      queryStringBehavior: cloudfront.CacheQueryStringBehavior.all(),
+      headerBehavior: cloudfront.CacheHeaderBehavior.allowList('Accept'),
+      cookieBehavior: cloudfront.CacheCookieBehavior.none(),
+      enableAcceptEncodingGzip: true,
+      enableAcceptEncodingBrotli: true,
+    });
+
     let distribution: cloudfront.Distribution;
     if (props?.domainName && props?.hostedZoneDomain) {
       const hostedZone = route53.HostedZone.fromLookup(this, 'AdoptaiHostedZone', {
@@ -104,8 +169,12 @@ export class AdoptaiStack extends cdk.Stack {
           origin: new origins.FunctionUrlOrigin(functionUrl),
           viewerProtocolPolicy: cloudfront.ViewerProtocolPolicy.REDIRECT_TO_HTTPS,
           allowedMethods: cloudfront.AllowedMethods.ALLOW_GET_HEAD_OPTIONS,
-          cachePolicy: cloudfront.CachePolicy.CACHING_DISABLED,
+          cachePolicy: apiCachePolicy,
           originRequestPolicy: cloudfront.OriginRequestPolicy.ALL_VIEWER_EXCEPT_HOST_HEADER,
+          functionAssociations: [{
+            function: normalizeAccept,
+            eventType: cloudfront.FunctionEventType.VIEWER_REQUEST,
+          }],
         },
         domainNames: [props.domainName],
         certificate,
@@ -131,8 +200,12 @@ export class AdoptaiStack extends cdk.Stack {
           origin: new origins.FunctionUrlOrigin(functionUrl),
           viewerProtocolPolicy: cloudfront.ViewerProtocolPolicy.REDIRECT_TO_HTTPS,
           allowedMethods: cloudfront.AllowedMethods.ALLOW_GET_HEAD_OPTIONS,
-          cachePolicy: cloudfront.CachePolicy.CACHING_DISABLED,
+          cachePolicy: apiCachePolicy,
           originRequestPolicy: cloudfront.OriginRequestPolicy.ALL_VIEWER_EXCEPT_HOST_HEADER,
+          functionAssociations: [{
+            function: normalizeAccept,
+            eventType: cloudfront.FunctionEventType.VIEWER_REQUEST,
+          }],
         },
         minimumProtocolVersion: cloudfront.SecurityPolicyProtocol.TLS_V1_2_2021,
         httpVersion: cloudfront.HttpVersion.HTTP2_AND_3,
@@ -0,0 +1,61 @@
+// CloudFront viewer-request function: reduce the Accept header to the media
+// type the API will answer with, so the edge cache holds at most one entry
+// per URL and body format instead of one per client Accept string.
+// Same rules as negotiate_media_type() in lambda/handler.py.
+
+var ALIASES = {
+  'application/x-msgpack': 'application/msgpack',
+  'application/vnd.msgpack': 'application/msgpack',
+};
+var BINARY_TYPES = ['application/msgpack', 'application/cbor'];
+
+function qualities(header) {
+  var result = {};
+  header.split(',').forEach(function (part) {
+    var pieces = part.split(';');
+    var type = pieces[0].trim().toLowerCase();
+    if (!type) {
+      return;
+    }
+    type = ALIASES[type] || type;
+    var q = 1;
+    for (var i = 1; i < pieces.length; i++) {
+      var option = pieces[i].trim().split('=');
+      if (option[0].toLowerCase() === 'q') {
+        q = parseFloat(option[1]) || 0;
+      }
+    }
+    if (!(type in result) || q > result[type]) {
+      result[type] = q;
+    }
+  });
+  return result;
+}
+
+function handler(event) {
+  var request = event.request;
+  var accept = request.headers['accept'];
+  var q = qualities(accept ? accept.value : '');
+
+  var jsonQ = 0;
+  if ('application/json' in q) {
+    jsonQ = q['application/json'];
+  } else if ('application/*' in q) {
+    jsonQ = q['application/*'];
+  } else if ('*/*' in q) {
+    jsonQ = q['*/*'];
+  }
+
+  var best = 'application/json';
+  var bestQ = 0;
+  BINARY_TYPES.forEach(function (type) {
+    var typeQ = q[type] || 0;
+    if (typeQ > bestQ && typeQ >= jsonQ) {
+      best = type;
+      bestQ = typeQ;
+    }
+  });
+
+  request.headers['accept'] = { value: best };
+  return request;
+}
@@ -0,0 +1,34 @@
+"""
+Compile data/sessions.json and data/speakers.json into the snapshots loaded by the handler
+
+Usage: python compile_snapshot.py <data_dir> <output_dir>
+
+Run by the CDK data deployment before upload, so the Lambda init path loads
+epoch timestamps and the prebuilt search index instead of recomputing them.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import handler
+
+
+def main(data_dir: Path, output_dir: Path) -> None:
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    compilers = {
+        "sessions": handler.compile_sessions_snapshot,
+        "speakers": handler.compile_speakers_snapshot,
+    }
+    for name, compile_snapshot in compilers.items():
+        snapshot = compile_snapshot((data_dir / f"{name}.json").read_bytes())
+        target = output_dir / f"{name}.snapshot.json"
+        target.write_text(json.dumps(snapshot, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        print(f"{target}: version {snapshot['version']}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit(__doc__.strip())
+    main(Path(sys.argv[1]), Path(sys.argv[2]))
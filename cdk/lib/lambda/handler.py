@@ -3,32 +3,280 @@ AdoptAI API Lambda Handler
 REST API for Adopt AI Grand Palais conference schedule
 """
 
+import base64
+import bisect
+import csv
+import gzip
+import hashlib
+import heapq
+import io
 import json
+import math
 import os
+import re
+import struct
+import threading
+import time
+import unicodedata
 import boto3
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
 from typing import Any
-from urllib.parse import parse_qs
+from urllib.parse import parse_qs, unquote
 from botocore.exceptions import ClientError
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 
+try:
+    import brotli
+except ImportError:
+    # Bundled from requirements.txt; gzip only when running without it
+    brotli = None
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+except ImportError:
+    # Only needed for ?format=arrow, which is refused when it is not bundled
+    pyarrow = None
+
 # Global cache for data
-_sessions_cache: list[dict] | None = None
-_speakers_cache: list[dict] | None = None
+_sessions_cache: "list[Session] | None" = None
+_speakers_cache: "list[Speaker] | None" = None
 _llms_txt_cache: str | None = None
+_sessions_index: "SessionIndex | None" = None
+_join_index: "JoinIndex | None" = None
+_speakers_index: "SpeakerIndex | None" = None
+_session_columns: "ColumnTable | None" = None
+_speaker_columns: "ColumnTable | None" = None
+
+# LRU cache of serialized response bodies, keyed by path + normalized query
+_response_cache: OrderedDict[tuple, str] = OrderedDict()
+_response_cache_bytes = 0
+
+# Last ?now=true body (without currentTime) and the time range it is valid for
+_now_cache: "NowCacheEntry | None" = None
+
+# Hot reload state: S3 ETag of each loaded object (for data loaded from a
+# snapshot, the ETag of the raw file it was compiled from), data rebuilt by
+# the background refresh and waiting to be installed, and the last check time
+_data_etags: dict[str, str] = {}
+_pending_data: dict[str, Any] = {}
+_last_refresh_check = float("-inf")
+
+# Content-derived version of the loaded sessions and speakers, and for each
+# the per-record hashes of the last DATA_HISTORY_SIZE versions (oldest first)
+_data_versions: dict[str, str] = {}
+_data_history: dict[str, OrderedDict[str, dict[str, str]]] = {}
+_refresh_lock = threading.Lock()
 
 # Environment variables
 BUCKET_NAME = os.environ.get("BUCKET_NAME", "")
 DATA_PREFIX = os.environ.get("DATA_PREFIX", "data")
+# "eager" loads every S3 object in parallel at import (SnapStart snapshot
+# phase); "lazy" defers each load to the first request that needs it
+DATA_LOADING = os.environ.get("DATA_LOADING", "eager")
+# Seconds between freshness checks of sessions.json/speakers.json (0 disables)
+DATA_REFRESH_SECONDS = int(os.environ.get("DATA_REFRESH_SECONDS", "0"))
+# Versions of each data file kept for /changes?since=
+DATA_HISTORY_SIZE = int(os.environ.get("DATA_HISTORY_SIZE", "16"))
+RESPONSE_CACHE_MAX_BYTES = int(os.environ.get("RESPONSE_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+# Layout version of the compiled *.snapshot.json files. Bump it whenever the
+# snapshot content or SessionIndex changes so stale snapshots are ignored.
+SNAPSHOT_FORMAT = 8
+
+PARIS_TZ = ZoneInfo("Europe/Paris")
+
+# Pagination (?limit=&cursor=) and projection (?fields=) of list endpoints
+MAX_PAGE_SIZE = 500
+SESSION_FIELDS = ("id", "title", "date", "time", "stage", "speakers", "ecosystems")
+SPEAKER_FIELDS = ("name", "initials", "company", "title", "sessions")
+
+# ?sort= of /sessions: file order (default) or BM25F relevance to ?search=
+SORT_ORDERS = ("relevance",)
+
+# Facets counted by /facets and ?facets=. Companies have hundreds of values,
+# so they are only counted when requested.
+FACETS = ("stage", "ecosystem", "company", "date")
+DEFAULT_FACETS = ("stage", "ecosystem", "date")
+
+# /batch: sub-query paths and the maximum number of sub-queries per call
+BATCH_PATHS = ("/sessions", "/speakers")
+MAX_BATCH_QUERIES = 20
+
+# /itinerary: default travel time between two different stages, its upper
+# bound for ?buffer=, and the weight of explicitly requested sessions (high
+# enough that no number of interest matches outweighs one of them)
+TRAVEL_BUFFER_MINUTES = 5
+MAX_TRAVEL_BUFFER_MINUTES = 60
+REQUESTED_SESSION_WEIGHT = 1000.0
+
+# ?format= of list endpoints: the JSON envelope, or one record per line
+SESSION_FORMATS = ("json", "ndjson", "ics", "csv", "arrow")
+SPEAKER_FORMATS = ("json", "ndjson", "csv", "arrow")
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+ICS_CONTENT_TYPE = "text/calendar"
+CSV_CONTENT_TYPE = "text/csv"
+ARROW_CONTENT_TYPE = "application/vnd.apache.arrow.stream"
+COLUMNAR_CONTENT_TYPES = {"csv": CSV_CONTENT_TYPE, "arrow": ARROW_CONTENT_TYPE}
+
+# Columns of the csv/arrow exports, each with the public field it is
+# flattened from (for ?fields=). List values are joined with MULTI_VALUE_SEPARATOR.
+SESSION_COLUMNS = (
+    ("id", "id"),
+    ("title", "title"),
+    ("date", "date"),
+    ("time", "time"),
+    ("stage", "stage"),
+    ("speaker_names", "speakers"),
+    ("speaker_companies", "speakers"),
+    ("speaker_titles", "speakers"),
+    ("ecosystems", "ecosystems"),
+)
+SPEAKER_COLUMNS = (
+    ("name", "name"),
+    ("initials", "initials"),
+    ("company", "company"),
+    ("title", "title"),
+    ("session_ids", "sessions"),
+    ("session_count", "sessions"),
+)
+MULTI_VALUE_SEPARATOR = "; "
+
+# Binary alternatives to JSON, picked from the Accept header. Registered
+# aliases map to the media type used in responses and cache keys.
+MSGPACK_CONTENT_TYPE = "application/msgpack"
+CBOR_CONTENT_TYPE = "application/cbor"
+MEDIA_TYPE_ALIASES = {
+    "application/x-msgpack": MSGPACK_CONTENT_TYPE,
+    "application/vnd.msgpack": MSGPACK_CONTENT_TYPE,
+}
+
+# Wrapper of the iCalendar exports (/sessions.ics, ?format=ics)
+ICS_HEADER = (
+    "BEGIN:VCALENDAR\r\n"
+    "VERSION:2.0\r\n"
+    "PRODID:-//AdoptAI API//Sessions//EN\r\n"
+    "CALSCALE:GREGORIAN\r\n"
+    "METHOD:PUBLISH\r\n"
+    "X-WR-CALNAME:Adopt AI Grand Palais 2025\r\n"
+    "X-WR-TIMEZONE:Europe/Paris\r\n"
+)
+ICS_FOOTER = "END:VCALENDAR\r\n"
+ICS_LOCATION_SUFFIX = ", Grand Palais, Paris"
+
+# Bodies smaller than this are sent uncompressed
+MIN_COMPRESS_BYTES = 1024
+
+# Cache-Control per kind of response. Data only changes on deploy (or once
+# per refresh interval with hot reload), while ?now=true answers move with
+# the clock.
+DATA_CACHE_CONTROL = (
+    f"public, max-age={DATA_REFRESH_SECONDS}, s-maxage={DATA_REFRESH_SECONDS}"
+    if DATA_REFRESH_SECONDS else
+    "public, max-age=300, s-maxage=3600"
+)
+NOW_CACHE_CONTROL = "public, max-age=30, s-maxage=30"
+NO_CACHE_CONTROL = "no-store"
 
 s3_client = boto3.client("s3")
 
 
+class BadRequestError(ValueError):
+    """Invalid query parameter, answered with a 400"""
+
+
+@dataclass(slots=True)
+class Session:
+    """In-memory session record built once at load
+
+    `public` is the projection returned by the API (with the formatted
+    `time`), shared by every response that includes the session, and
+    `fragment` is its JSON encoding. `vevent` is its iCalendar event (empty
+    without a start time). `members` caches the encoded members of `public`
+    for ?fields= projections, once one has needed them.
+    """
+    id: str
+    title: str
+    date: str
+    start_time: str | None
+    end_time: str | None
+    stage: str
+    speakers: list[dict]
+    ecosystems: list[str]
+    start_dt: datetime | None
+    end_dt: datetime | None
+    public: dict
+    fragment: str
+    vevent: str
+    members: dict[str, str] | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict, start_dt: datetime | None, end_dt: datetime | None) -> "Session":
+        """Build a record from a sessions.json entry and its parsed datetimes"""
+        public = format_session(data)
+        return cls(
+            id=public["id"],
+            title=public["title"],
+            date=public["date"],
+            start_time=data.get("startTime"),
+            end_time=data.get("endTime"),
+            stage=public["stage"],
+            speakers=public["speakers"],
+            ecosystems=public["ecosystems"],
+            start_dt=start_dt,
+            end_dt=end_dt,
+            public=public,
+            fragment=json.dumps(public, ensure_ascii=False),
+            vevent=format_vevent(data, start_dt, end_dt),
+        )
+
+
+@dataclass(slots=True)
+class Speaker:
+    """In-memory speaker record built once at load
+
+    `public` is the speakers.json entry, returned as is by the API, and
+    `fragment` is its JSON encoding. `members` is the same cache as
+    Session.members.
+    """
+    name: str
+    company: str
+    title: str
+    search_fields: tuple[str, ...]
+    public: dict
+    fragment: str
+    members: dict[str, str] | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Speaker":
+        """Build a record from a speakers.json entry"""
+        return cls(
+            name=data.get("name", ""),
+            company=data.get("company", ""),
+            title=data.get("title", ""),
+            search_fields=speaker_search_fields(data),
+            public=data,
+            fragment=json.dumps(data, ensure_ascii=False),
+        )
+
+
+def as_session(item: "Session | dict") -> Session:
+    """Accept raw session dicts (with optional _start_dt/_end_dt) next to records"""
+    if isinstance(item, Session):
+        return item
+    return Session.from_dict(item, item.get("_start_dt"), item.get("_end_dt"))
+
+
 def load_json_from_s3(key: str) -> dict:
     """Load JSON file from S3"""
     try:
         response = s3_client.get_object(Bucket=BUCKET_NAME, Key=key)
-        return json.loads(response["Body"].read().decode("utf-8"))
+        data = json.loads(response["Body"].read().decode("utf-8"))
+        _data_etags[key] = response.get("ETag", "")
+        return data
     except ClientError as e:
         error_code = e.response.get("Error", {}).get("Code", "Unknown")
         raise RuntimeError(f"S3 error ({error_code}) loading {key}") from e
@@ -36,38 +284,252 @@ def load_json_from_s3(key: str) -> dict:
         raise RuntimeError(f"Invalid JSON in {key}") from e
 
 
-def get_sessions() -> list[dict]:
-    """Get sessions data with caching and pre-parsed datetimes"""
-    global _sessions_cache
+def get_sessions() -> list[Session]:
+    """Get session records with caching, pre-parsed datetimes and search index
+
+    Loads the compiled snapshot when it is deployed, and falls back to
+    parsing sessions.json and building the index otherwise.
+    """
+    global _sessions_cache, _sessions_index
     if _sessions_cache is None:
-        data = load_json_from_s3(f"{DATA_PREFIX}/sessions.json")
-        sessions = data.get("sessions", [])
-
-        # Pre-parse all session datetimes for better performance with SnapStart
-        # This happens once per Lambda instance and is cached across invocations
-        for session in sessions:
-            session["_start_dt"] = parse_session_datetime(
-                session.get("date", ""),
-                session.get("startTime", "")
-            )
-            session["_end_dt"] = parse_session_datetime(
-                session.get("date", ""),
-                session.get("endTime", "")
-            )
+        loaded = load_snapshot("sessions", sessions_from_snapshot)
+        if loaded is None:
+            loaded = sessions_from_json(load_json_from_s3(f"{DATA_PREFIX}/sessions.json"))
 
-        _sessions_cache = sessions
+        _sessions_cache, _sessions_index = loaded
+        record_data_version("sessions", _sessions_cache)
+        clear_response_cache()
     return _sessions_cache
 
 
-def get_speakers() -> list[dict]:
-    """Get speakers data with caching"""
+def get_speakers() -> list[Speaker]:
+    """Get speaker records with caching (from the compiled snapshot when deployed)"""
     global _speakers_cache
     if _speakers_cache is None:
-        data = load_json_from_s3(f"{DATA_PREFIX}/speakers.json")
-        _speakers_cache = data.get("speakers", [])
+        speakers = load_snapshot("speakers", speakers_from_snapshot)
+        if speakers is None:
+            speakers = speakers_from_json(load_json_from_s3(f"{DATA_PREFIX}/speakers.json"))
+
+        _speakers_cache = speakers
+        record_data_version("speakers", _speakers_cache)
+        clear_response_cache()
     return _speakers_cache
 
 
+def sessions_from_json(data: dict) -> tuple[list[Session], "SessionIndex"]:
+    """Build session records and their index from parsed sessions.json"""
+    # Pre-parse all session datetimes for better performance with SnapStart
+    # This happens once per Lambda instance and is cached across invocations
+    sessions = [session_from_raw(raw) for raw in data.get("sessions", [])]
+    return sessions, build_session_index(sessions)
+
+
+def speakers_from_json(data: dict) -> list[Speaker]:
+    """Build speaker records from parsed speakers.json"""
+    return [Speaker.from_dict(raw) for raw in data.get("speakers", [])]
+
+
+def session_from_raw(raw: dict) -> Session:
+    """Build a record from a sessions.json entry, parsing its datetimes"""
+    return Session.from_dict(
+        raw,
+        parse_session_datetime(raw.get("date", ""), raw.get("startTime", "")),
+        parse_session_datetime(raw.get("date", ""), raw.get("endTime", "")),
+    )
+
+
+def content_version(source: bytes) -> str:
+    """Version identifier derived from the content of a data file"""
+    return hashlib.sha256(source).hexdigest()[:16]
+
+
+def source_etag(source: bytes) -> str:
+    """S3 ETag of a data file uploaded in one part with SSE-S3: its quoted MD5
+
+    Other uploads get other ETags, which only costs one unneeded reload.
+    """
+    return f'"{hashlib.md5(source, usedforsecurity=False).hexdigest()}"'
+
+
+def record_key(record: "Session | Speaker") -> str:
+    """Identity of a record across data versions: session id or speaker name"""
+    return record.id if isinstance(record, Session) else record.name
+
+
+def record_hashes(records: list) -> dict[str, str]:
+    """Content hash of each record's JSON encoding, by record key"""
+    return {
+        record_key(r): hashlib.blake2b(r.fragment.encode("utf-8"), digest_size=8).hexdigest()
+        for r in records
+    }
+
+
+def record_data_version(name: str, records: list) -> str:
+    """Version a freshly loaded sessions or speakers list and add it to the history
+
+    The version hashes the record hashes in list order, so it is the same
+    whether the data came from a snapshot or the raw JSON, and only changes
+    with the content. The history keeps the last DATA_HISTORY_SIZE versions.
+    """
+    hashes = record_hashes(records)
+    digest = hashlib.blake2b(digest_size=8)
+    for key, record_hash in hashes.items():
+        digest.update(f"{key}\0{record_hash}\n".encode("utf-8"))
+    version = digest.hexdigest()
+
+    history = _data_history.setdefault(name, OrderedDict())
+    history[version] = hashes
+    history.move_to_end(version)
+    while len(history) > max(DATA_HISTORY_SIZE, 1):
+        history.popitem(last=False)
+    _data_versions[name] = version
+    return version
+
+
+def get_data_version() -> str:
+    """Version of the whole dataset, as <sessions version>.<speakers version>"""
+    get_sessions()
+    get_speakers()
+    return f"{_data_versions['sessions']}.{_data_versions['speakers']}"
+
+
+def load_snapshot(name: str, decode):
+    """Load and decode data/<name>.snapshot.json
+
+    Returns None when the snapshot is missing, has another format, or cannot
+    be decoded, so the caller can fall back to the raw JSON.
+    """
+    key = f"{DATA_PREFIX}/{name}.snapshot.json"
+    try:
+        snapshot = load_json_from_s3(key)
+        if snapshot.get("format") != SNAPSHOT_FORMAT:
+            print(f"Ignoring {key}: format {snapshot.get('format')} != {SNAPSHOT_FORMAT}")
+            return None
+        decoded = decode(snapshot)
+        # The raw file's ETag, so that hot reload starts with conditional GETs
+        _data_etags[f"{DATA_PREFIX}/{name}.json"] = snapshot["source_etag"]
+        return decoded
+    except (RuntimeError, KeyError, TypeError, ValueError) as e:
+        print(f"Snapshot {key} not used: {e}")
+        return None
+
+
+def encode_bitsets(bitsets: dict[str, int]) -> dict[str, str]:
+    """Bitsets as hex strings: shorter than decimal and still quick to parse"""
+    return {key: format(bits, "x") for key, bits in bitsets.items()}
+
+
+def decode_bitsets(encoded: dict[str, str]) -> dict[str, int]:
+    """Inverse of encode_bitsets"""
+    return {key: int(bits, 16) for key, bits in encoded.items()}
+
+
+def compile_sessions_snapshot(source: bytes) -> dict:
+    """Compile sessions.json into its snapshot: epoch times and the prebuilt index
+
+    Only the costly parts of the index are stored: sessions_from_snapshot
+    derives positions, all_mask, the running masks and terms again, and
+    word_grams is built on first use.
+    """
+    raw_sessions = json.loads(source).get("sessions", [])
+    sessions = [session_from_raw(raw) for raw in raw_sessions]
+    index = build_session_index(sessions)
+
+    return {
+        "format": SNAPSHOT_FORMAT,
+        "version": content_version(source),
+        "source_etag": source_etag(source),
+        "sessions": raw_sessions,
+        "starts": [s.start_dt.timestamp() if s.start_dt else None for s in sessions],
+        "ends": [s.end_dt.timestamp() if s.end_dt else None for s in sessions],
+        "index": {
+            "search_fields": index.search_fields,
+            "ngrams": encode_bitsets(index.ngrams),
+            "words": encode_bitsets(index.words),
+            "dates": encode_bitsets(index.dates),
+            "stages": encode_bitsets(index.stages),
+            "facets": {name: encode_bitsets(values) for name, values in index.facets.items()},
+            "morning_mask": format(index.morning_mask, "x"),
+            "afternoon_mask": format(index.afternoon_mask, "x"),
+            "start_times": index.start_times,
+            "start_positions": index.start_positions,
+            "end_times": index.end_times,
+            "term_postings": index.term_postings,
+        },
+    }
+
+
+def sessions_from_snapshot(snapshot: dict) -> tuple[list[Session], "SessionIndex"]:
+    """Rebuild session records and their index from a compiled snapshot"""
+    sessions = [
+        Session.from_dict(
+            raw,
+            datetime.fromtimestamp(start, PARIS_TZ) if start is not None else None,
+            datetime.fromtimestamp(end, PARIS_TZ) if end is not None else None,
+        )
+        for raw, start, end in zip(snapshot["sessions"], snapshot["starts"], snapshot["ends"], strict=True)
+    ]
+
+    positions: dict[str, int] = {}
+    for pos, session in enumerate(sessions):
+        positions.setdefault(session.id, pos)
+
+    data = snapshot["index"]
+    running_bounds, running_at, running_after = build_running_masks(
+        data["start_times"], data["start_positions"], data["end_times"]
+    )
+    term_postings = data["term_postings"]
+    return sessions, SessionIndex(
+        sessions=sessions,
+        positions=positions,
+        all_mask=(1 << len(sessions)) - 1,
+        search_fields=[tuple(f) for f in data["search_fields"]],
+        ngrams=decode_bitsets(data["ngrams"]),
+        words=decode_bitsets(data["words"]),
+        word_grams=None,
+        dates=decode_bitsets(data["dates"]),
+        stages=decode_bitsets(data["stages"]),
+        facets={name: decode_bitsets(values) for name, values in data["facets"].items()},
+        morning_mask=int(data["morning_mask"], 16),
+        afternoon_mask=int(data["afternoon_mask"], 16),
+        start_times=data["start_times"],
+        start_positions=data["start_positions"],
+        end_times=data["end_times"],
+        running_bounds=running_bounds,
+        running_at=running_at,
+        running_after=running_after,
+        term_postings=term_postings,
+        terms=sorted(term_postings),
+    )
+
+
+def compile_speakers_snapshot(source: bytes) -> dict:
+    """Compile speakers.json into its snapshot with precomputed search fields"""
+    raw_speakers = json.loads(source).get("speakers", [])
+    return {
+        "format": SNAPSHOT_FORMAT,
+        "version": content_version(source),
+        "source_etag": source_etag(source),
+        "speakers": raw_speakers,
+        "search_fields": [speaker_search_fields(raw) for raw in raw_speakers],
+    }
+
+
+def speakers_from_snapshot(snapshot: dict) -> list[Speaker]:
+    """Rebuild speaker records from a compiled snapshot"""
+    return [
+        Speaker(
+            name=raw.get("name", ""),
+            company=raw.get("company", ""),
+            title=raw.get("title", ""),
+            search_fields=tuple(search_fields),
+            public=raw,
+            fragment=json.dumps(raw, ensure_ascii=False),
+        )
+        for raw, search_fields in zip(snapshot["speakers"], snapshot["search_fields"], strict=True)
+    ]
+
+
 def get_llms_txt() -> str:
     """Get llms.txt content"""
     global _llms_txt_cache
@@ -119,7 +581,7 @@ def parse_session_datetime(date_str: str, time_str: str) -> datetime | None:
 
         # Parse date and combine with time
         dt = datetime.strptime(date_str, "%b %d, %Y")
-        dt = dt.replace(hour=hours, minute=minutes, second=0, microsecond=0, tzinfo=ZoneInfo("Europe/Paris"))
+        dt = dt.replace(hour=hours, minute=minutes, second=0, microsecond=0, tzinfo=PARIS_TZ)
 
         return dt
     except Exception:
@@ -128,138 +590,2035 @@ def parse_session_datetime(date_str: str, time_str: str) -> datetime | None:
 
 def get_paris_now() -> datetime:
     """Get current time in Paris timezone"""
-    return datetime.now(ZoneInfo("Europe/Paris"))
+    return datetime.now(PARIS_TZ)
 
 
-def filter_sessions_by_now(sessions: list[dict]) -> dict:
+def filter_sessions_by_now(sessions: list[Session]) -> dict:
     """Filter sessions happening now or starting soon (within 30 minutes)
 
-    Uses pre-parsed datetimes (_start_dt, _end_dt) cached in session objects.
-    This optimization leverages SnapStart caching for better performance.
+    Answered by bisection on the start times of the session index, where the
+    fallback end times are already resolved.
+    """
+    index = get_session_index(sessions)
+    ongoing, upcoming, _ = sessions_at(index, get_paris_now().timestamp())
+
+    return {
+        "ongoing": [sessions[pos] for pos in ongoing],
+        "upcoming": [sessions[pos] for pos in upcoming],
+    }
+
+
+def sessions_at(index: "SessionIndex", now_ts: float) -> tuple[list[int], list[int], float]:
+    """Positions of ongoing and upcoming sessions at now_ts, in file order
+
+    Also returns the first instant after now_ts at which the answer can
+    change: the next start, the next start entering the upcoming window, or
+    the end of an ongoing session.
     """
-    now = get_paris_now()
-    in_30_min = now + timedelta(minutes=30)
+    in_30_min_ts = now_ts + UPCOMING_WINDOW.total_seconds()
+    started = bisect.bisect_right(index.start_times, now_ts)
+    soon = bisect.bisect_right(index.start_times, in_30_min_ts)
+
+    # The running sessions only change at the bounds: the next one, or now
+    # itself when sessions end exactly at now
+    bounds = index.running_bounds
+    i = bisect.bisect_right(bounds, now_ts) - 1
+    boundaries = [bounds[i + 1]] if i + 1 < len(bounds) else []
+    if i < 0:
+        running = 0
+    elif bounds[i] == now_ts:
+        running = index.running_at[i]
+        if running != index.running_after[i]:
+            boundaries.append(now_ts)
+    else:
+        running = index.running_after[i]
 
-    ongoing = []
-    upcoming = []
+    ongoing = list(iter_bits(running))
+    upcoming = sorted(index.start_positions[started:soon])
 
-    for session in sessions:
-        # Use pre-parsed datetimes from cache (set in get_sessions())
-        start_dt = session.get("_start_dt")
-        end_dt = session.get("_end_dt")
+    if soon < len(index.start_times):
+        boundaries.append(index.start_times[soon] - UPCOMING_WINDOW.total_seconds())
+    valid_until = min(boundaries, default=float("inf"))
 
-        if not start_dt:
-            continue
+    return ongoing, upcoming, valid_until
+
+
+@dataclass
+class NowCacheEntry:
+    """Serialized ?now=true answer, reusable while valid_from <= now < valid_until"""
+    index: "SessionIndex"
+    valid_from: float
+    valid_until: float
+    body_suffix: str
 
-        # If no valid end time, assume session is still ongoing if it started recently
-        if not end_dt or end_dt <= start_dt:
-            # Fallback: assume session lasts 20 minutes (median gap from analysis)
-            end_dt = start_dt + timedelta(minutes=20)
 
-        # Check if session is ongoing
-        if start_dt <= now <= end_dt:
-            ongoing.append(session)
-        # Check if session starts within 30 minutes
-        elif start_dt > now and start_dt <= in_30_min:
-            upcoming.append(session)
+def build_now_body(sessions: list[Session]) -> str:
+    """Serialized ?now=true body
 
+    Everything but currentTime is cached until the next boundary computed by
+    sessions_at, so most requests only format and splice in the clock.
+    """
+    global _now_cache
+    index = get_session_index(sessions)
+    paris_now = get_paris_now()
+    now_ts = paris_now.timestamp()
+
+    entry = _now_cache
+    if entry is None or entry.index is not index or not entry.valid_from <= now_ts < entry.valid_until:
+        ongoing, upcoming, valid_until = sessions_at(index, now_ts)
+        rest = encode_object([
+            ("ongoing", encode_object([
+                ("count", str(len(ongoing))),
+                ("sessions", encode_array(sessions[pos].fragment for pos in ongoing)),
+            ])),
+            ("upcoming", encode_object([
+                ("count", str(len(upcoming))),
+                ("description", '"Sessions starting within 30 minutes"'),
+                ("sessions", encode_array(sessions[pos].fragment for pos in upcoming)),
+            ])),
+        ])
+        entry = NowCacheEntry(index, now_ts, valid_until, ", " + rest[1:])
+        _now_cache = entry
+
+    current_time = json.dumps(paris_now.strftime("%Y-%m-%d %H:%M:%S %Z"), ensure_ascii=False)
+    return '{"currentTime": ' + current_time + entry.body_suffix
+
+
+# Sessions without a valid end time are assumed to last this long (median
+# gap from analysis)
+FALLBACK_DURATION = timedelta(minutes=20)
+
+# How far ahead ?now=true looks for upcoming sessions
+UPCOMING_WINDOW = timedelta(minutes=30)
+
+# Length of the n-grams stored in the search index. Queries shorter than this
+# are matched by scanning the folded fields instead.
+NGRAM_SIZE = 3
+
+# Typos tolerated per query word when a search has no exact match, by word
+# length: none below 4 letters, one up to 7, two from 8
+FUZZY_MIN_LENGTH = 4
+FUZZY_TWO_TYPOS_LENGTH = 8
+
+# BM25F parameters of ?sort=relevance: per-field weights, term frequency
+# saturation and length normalization
+RELEVANCE_FIELD_WEIGHTS = {"title": 3.0, "speakers": 2.0, "companies": 1.5, "ecosystems": 1.0}
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+
+@dataclass
+class SessionIndex:
+    """Search structures built once per sessions list
+
+    Session sets are int bitsets where bit i stands for sessions[i], so
+    intersections are a single `&` and iteration keeps file order.
+
+    Timed sessions are also kept sorted by start: start_times[i] (epoch
+    seconds) belongs to sessions[start_positions[i]], which ends at
+    end_times[i] with the fallback duration already applied.
+
+    running_bounds are the distinct start and end instants, sorted. The
+    sessions running at running_bounds[i] are running_at[i], and those
+    running strictly between it and the next bound are running_after[i],
+    so ?now=true needs one bisect however long sessions last.
+
+    positions maps each session id to its position (first one wins).
+
+    words maps each word of the search fields to its sessions, and
+    word_grams each trigram of "^word$" to the words containing it: the
+    typo-tolerant fallback of ?search= looks up candidate words there.
+    That fallback is rare, so word_grams stays None until it first runs.
+
+    facets maps each of FACETS to its values and their bitsets. Values are
+    grouped case- and accent-insensitively under their first spelling.
+
+    term_postings holds the ranking statistics: for each term of the
+    RELEVANCE_FIELD_WEIGHTS fields, the sessions containing it with their
+    weighted, length-normalized term frequency. terms is its sorted
+    vocabulary, for prefix lookups.
+    """
+    sessions: list[Session]
+    positions: dict[str, int]
+    all_mask: int
+    search_fields: list[tuple[str, ...]]
+    ngrams: dict[str, int]
+    words: dict[str, int]
+    word_grams: dict[str, list[str]] | None
+    dates: dict[str, int]
+    stages: dict[str, int]
+    facets: dict[str, dict[str, int]]
+    morning_mask: int
+    afternoon_mask: int
+    start_times: list[float]
+    start_positions: list[int]
+    end_times: list[float]
+    running_bounds: list[float]
+    running_at: list[int]
+    running_after: list[int]
+    term_postings: dict[str, list[tuple[int, float]]]
+    terms: list[str]
+
+
+def iter_bits(mask: int):
+    """Yield the positions of the set bits of mask, lowest first"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def fold(text: str) -> str:
+    """Case- and accent-insensitive form of a text ("Mirón" -> "miron")"""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def session_search_fields(session: Session) -> tuple[str, ...]:
+    """Folded fields matched by ?search= (title, speakers, ecosystems)"""
+    fields = [fold(session.title)]
+    for sp in session.speakers:
+        fields.append(fold(sp.get("name", "")))
+        fields.append(fold(sp.get("company", "")))
+        fields.append(fold(sp.get("title", "")))
+    fields.extend(fold(eco) for eco in session.ecosystems)
+    return tuple(f for f in fields if f)
+
+
+def tokenize(text: str) -> list[str]:
+    """Folded words of a text"""
+    return TOKEN_PATTERN.findall(fold(text))
+
+
+def word_grams(word: str) -> list[str]:
+    """Trigrams of a word with its boundaries marked, so short words have some"""
+    marked = f"^{word}$"
+    return [marked[i:i + 3] for i in range(len(marked) - 2)]
+
+
+def build_word_index(search_fields: list[tuple[str, ...]]) -> dict[str, int]:
+    """Word -> bitset postings of folded search fields"""
+    words: dict[str, int] = {}
+    for pos, fields in enumerate(search_fields):
+        bit = 1 << pos
+        for text in fields:
+            for word in TOKEN_PATTERN.findall(text):
+                words[word] = words.get(word, 0) | bit
+
+    return words
+
+
+def build_word_grams(words: dict[str, int]) -> dict[str, list[str]]:
+    """Trigram -> words containing it, in vocabulary order"""
+    grams: dict[str, list[str]] = {}
+    for word in words:
+        for gram in set(word_grams(word)):
+            grams.setdefault(gram, []).append(word)
+    return grams
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Edit distance counting adjacent transpositions, or limit + 1 once it exceeds limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if previous2 is not None and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+def fuzzy_search(words: dict[str, int], grams: dict[str, list[str]], query: str, mask: int) -> int:
+    """Bitset of the records of mask matching every word of query up to a few typos
+
+    Candidate words are those sharing a trigram with the query word, so the
+    vocabulary is never scanned, and starting with the same letter: a typo
+    there more often means another word ("ranking" is not "banking"). Words
+    shorter than FUZZY_MIN_LENGTH must match exactly.
+    """
+    query_words = set(tokenize(query))
+    if not query_words:
+        return 0
+
+    for query_word in query_words:
+        if len(query_word) < FUZZY_MIN_LENGTH:
+            mask &= words.get(query_word, 0)
+        else:
+            limit = 1 if len(query_word) < FUZZY_TWO_TYPOS_LENGTH else 2
+            candidates = {
+                word for gram in word_grams(query_word) for word in grams.get(gram, ())
+                if word[0] == query_word[0]
+            }
+            matched = 0
+            for word in candidates:
+                if edit_distance(query_word, word, limit) <= limit:
+                    matched |= words[word]
+            mask &= matched
+        if not mask:
+            return 0
+    return mask
+
+
+def session_ranking_fields(session: Session) -> dict[str, list[str]]:
+    """Tokens of each field scored by ?sort=relevance"""
     return {
-        "ongoing": ongoing,
-        "upcoming": upcoming,
+        "title": tokenize(session.title),
+        "speakers": [t for sp in session.speakers for t in tokenize(sp.get("name", ""))],
+        "companies": [t for sp in session.speakers for t in tokenize(sp.get("company", ""))],
+        "ecosystems": [t for eco in session.ecosystems for t in tokenize(eco)],
     }
 
 
-def filter_sessions(sessions: list[dict], params: dict) -> list[dict]:
-    """Filter sessions based on query parameters"""
-    filtered = sessions.copy()
+def build_term_postings(sessions: list[Session]) -> dict[str, list[tuple[int, float]]]:
+    """BM25F term statistics: per term, (position, pseudo term frequency) pairs
+
+    The pseudo frequency sums the field weight times the length-normalized
+    frequency of the term in each field, so queries only add up idf-scaled
+    saturations.
+    """
+    tokens = [session_ranking_fields(as_session(s)) for s in sessions]
+    avg_lengths = {
+        name: (sum(len(fields[name]) for fields in tokens) / len(tokens) if tokens else 0.0) or 1.0
+        for name in RELEVANCE_FIELD_WEIGHTS
+    }
+
+    postings: dict[str, list[tuple[int, float]]] = {}
+    for pos, fields in enumerate(tokens):
+        frequencies: dict[str, float] = {}
+        for name, weight in RELEVANCE_FIELD_WEIGHTS.items():
+            field_tokens = fields[name]
+            norm = 1 - BM25_B + BM25_B * len(field_tokens) / avg_lengths[name]
+            for token in field_tokens:
+                frequencies[token] = frequencies.get(token, 0.0) + weight / norm
+        for token, frequency in frequencies.items():
+            postings.setdefault(token, []).append((pos, frequency))
+    return postings
+
+
+def speaker_search_fields(speaker: dict) -> tuple[str, ...]:
+    """Folded fields matched by /speakers?search= (name, company, title)"""
+    fields = (
+        fold(speaker.get("name", "")),
+        fold(speaker.get("company", "")),
+        fold(speaker.get("title", "")),
+    )
+    return tuple(f for f in fields if f)
+
+
+def build_session_index(sessions: list[Session]) -> SessionIndex:
+    """Build the n-gram inverted index and filter bitsets used by filter_sessions
+
+    Raw session dicts are accepted too, for lists that were not loaded by
+    get_sessions().
+    """
+    search_fields = []
+    positions: dict[str, int] = {}
+    ngrams: dict[str, int] = {}
+    dates: dict[str, int] = {}
+    stages: dict[str, int] = {}
+    facets: dict[str, dict[str, int]] = {name: {} for name in FACETS}
+    spellings: dict[tuple[str, str], str] = {}
+    morning_mask = 0
+    afternoon_mask = 0
+    timed = []
+
+    for pos, item in enumerate(sessions):
+        session = as_session(item)
+        bit = 1 << pos
+        positions.setdefault(session.id, pos)
+
+        # Use pre-parsed datetimes (set in get_sessions())
+        start_dt = session.start_dt
+        if start_dt:
+            end_dt = session.end_dt
+            if not end_dt or end_dt <= start_dt:
+                end_dt = start_dt + FALLBACK_DURATION
+            timed.append((start_dt.timestamp(), pos, end_dt.timestamp()))
+
+        dates[session.date] = dates.get(session.date, 0) | bit
+        stage = session.stage.lower()
+        stages[stage] = stages.get(stage, 0) | bit
+
+        facet_values = [("stage", session.stage), ("date", session.date)]
+        facet_values.extend(("ecosystem", eco) for eco in session.ecosystems)
+        facet_values.extend(("company", sp.get("company", "")) for sp in session.speakers)
+        for name, value in facet_values:
+            if value:
+                value = spellings.setdefault((name, fold(value)), value)
+                facets[name][value] = facets[name].get(value, 0) | bit
+
+        # Same defaults as the former per-request filters: a missing
+        # startTime is neither morning nor afternoon
+        start_time = session.start_time
+        if parse_time("12:00 PM" if start_time is None else start_time) < 720:
+            morning_mask |= bit
+        if parse_time("0:00 AM" if start_time is None else start_time) >= 720:
+            afternoon_mask |= bit
+
+        fields = session_search_fields(session)
+        search_fields.append(fields)
+
+        for text in fields:
+            for i in range(len(text) - NGRAM_SIZE + 1):
+                gram = text[i:i + NGRAM_SIZE]
+                ngrams[gram] = ngrams.get(gram, 0) | bit
+
+    timed.sort()
+    start_times = [start for start, _, _ in timed]
+    start_positions = [pos for _, pos, _ in timed]
+    end_times = [end for _, _, end in timed]
+    running_bounds, running_at, running_after = build_running_masks(start_times, start_positions, end_times)
+    term_postings = build_term_postings(sessions)
+    words = build_word_index(search_fields)
+
+    return SessionIndex(
+        sessions=sessions,
+        positions=positions,
+        all_mask=(1 << len(sessions)) - 1,
+        search_fields=search_fields,
+        ngrams=ngrams,
+        words=words,
+        word_grams=None,
+        dates=dates,
+        stages=stages,
+        facets=facets,
+        morning_mask=morning_mask,
+        afternoon_mask=afternoon_mask,
+        start_times=start_times,
+        start_positions=start_positions,
+        end_times=end_times,
+        running_bounds=running_bounds,
+        running_at=running_at,
+        running_after=running_after,
+        term_postings=term_postings,
+        terms=sorted(term_postings),
+    )
+
+
+def build_running_masks(
+    start_times: list[float], start_positions: list[int], end_times: list[float]
+) -> tuple[list[float], list[int], list[int]]:
+    """running_bounds, running_at and running_after of SessionIndex, in one sweep"""
+    starting: dict[float, int] = {}
+    ending: dict[float, int] = {}
+    for start, pos, end in zip(start_times, start_positions, end_times):
+        starting[start] = starting.get(start, 0) | (1 << pos)
+        ending[end] = ending.get(end, 0) | (1 << pos)
+
+    bounds = sorted(starting.keys() | ending.keys())
+    running_at = []
+    running_after = []
+    running = 0
+    for bound in bounds:
+        # Sessions are running from their start to their end, both included
+        running |= starting.get(bound, 0)
+        running_at.append(running)
+        running &= ~ending.get(bound, 0)
+        running_after.append(running)
+    return bounds, running_at, running_after
+
+
+def get_session_index(sessions: list[Session]) -> SessionIndex:
+    """Return the cached index for the cached sessions, or build one for ad-hoc lists"""
+    if _sessions_index is not None and _sessions_index.sessions is sessions:
+        return _sessions_index
+    return build_session_index(sessions)
+
+
+def date_matches(date_filter: str, date: str) -> bool:
+    """Check a ?date= value against a session date ("Nov 25, 2025")"""
+    return (
+        date_filter in date or
+        (date_filter == "2025-11-25" and "Nov 25" in date) or
+        (date_filter == "2025-11-26" and "Nov 26" in date)
+    )
+
+
+def select_values(postings: dict[str, int], predicate) -> int:
+    """Union the bitsets of every distinct value accepted by predicate"""
+    mask = 0
+    for value, bits in postings.items():
+        if predicate(value):
+            mask |= bits
+    return mask
+
+
+def search_sessions(index: SessionIndex, query: str, mask: int | None = None) -> int:
+    """Return the bitset of sessions where query is a substring of a searchable field
+
+    Posting lists of every n-gram of the query are intersected to get the
+    candidates, which are then verified against the folded fields
+    (sharing all n-grams does not guarantee a contiguous match). When mask
+    is given, only those sessions are considered.
+    """
+    query = fold(query)
+
+    candidates = index.all_mask if mask is None else mask
+    for i in range(len(query) - NGRAM_SIZE + 1):
+        candidates &= index.ngrams.get(query[i:i + NGRAM_SIZE], 0)
+        if not candidates:
+            return 0
+
+    matches = 0
+    for pos in iter_bits(candidates):
+        if any(query in text for text in index.search_fields[pos]):
+            matches |= 1 << pos
+    return matches
+
+
+def match_session_search(index: SessionIndex, query: str, mask: int) -> int:
+    """Sessions of mask matching a search: substring matches, or typo-tolerant ones
+
+    The typo-tolerant fallback is only used when the query has no substring
+    match in the whole dataset, so that an answer emptied by the other
+    filters stays empty instead of turning into near misses.
+    """
+    exact = search_sessions(index, query)
+    if exact:
+        return exact & mask
+    if index.word_grams is None:
+        index.word_grams = build_word_grams(index.words)
+    return fuzzy_search(index.words, index.word_grams, query, mask)
+
+
+def session_search_is_fuzzy(index: SessionIndex, params: dict) -> bool:
+    """Whether ?search= is answered by the typo-tolerant fallback"""
+    search_filter = params.get("search", [None])[0]
+    return bool(search_filter) and not search_sessions(index, search_filter)
+
+
+def score_sessions(index: SessionIndex, query: str) -> dict[int, float]:
+    """BM25F score of each session with a non-zero score for query
+
+    Query words also match the indexed terms they are a prefix of ("bank"
+    scores "banking"): a session counts its most frequent matching term,
+    and the idf of the word is taken over all sessions matching it.
+    """
+    total = len(index.sessions)
+    scores: dict[int, float] = {}
+    for word in set(tokenize(query)):
+        best: dict[int, float] = {}
+        i = bisect.bisect_left(index.terms, word)
+        while i < len(index.terms) and index.terms[i].startswith(word):
+            for pos, frequency in index.term_postings[index.terms[i]]:
+                if frequency > best.get(pos, 0.0):
+                    best[pos] = frequency
+            i += 1
+
+        idf = math.log(1 + (total - len(best) + 0.5) / (len(best) + 0.5))
+        for pos, frequency in best.items():
+            scores[pos] = scores.get(pos, 0.0) + idf * frequency * (BM25_K1 + 1) / (frequency + BM25_K1)
+    return scores
+
+
+def rank_sessions(index: SessionIndex, mask: int, query: str, k: int | None = None) -> list[int]:
+    """Positions of mask by decreasing relevance to query, file order on ties
+
+    With k, only the k best are selected, with a heap instead of a full sort.
+    """
+    scores = score_sessions(index, query)
+
+    def order(pos: int) -> tuple[float, int]:
+        return -scores.get(pos, 0.0), pos
+
+    if k is None:
+        return sorted(iter_bits(mask), key=order)
+    return heapq.nsmallest(k, iter_bits(mask), key=order)
+
+
+def filter_sessions(sessions: list[Session], params: dict) -> list[Session]:
+    """Filter sessions based on query parameters, in file order"""
+    mask = filter_session_mask(get_session_index(sessions), params)
+    return [sessions[pos] for pos in iter_bits(mask)]
+
+
+def select_sessions(sessions: list[Session], params: dict) -> tuple[list[Session], int]:
+    """Filtered sessions in response order, and the number of matches
+
+    With ?sort=relevance the matches are ranked against ?search=. When a
+    page is requested, only the sessions up to the end of that page are
+    ranked, so the list may stop there.
+    """
+    if parse_sort(params) is None:
+        filtered = filter_sessions(sessions, params)
+        return filtered, len(filtered)
+
+    index = get_session_index(sessions)
+    mask = filter_session_mask(index, params)
+    offset, limit = parse_page(params)
+    k = None if limit is None else offset + limit
+    ranked = rank_sessions(index, mask, params.get("search", [""])[0] or "", k)
+    return [sessions[pos] for pos in ranked], mask.bit_count()
+
+
+def parse_sort(params: dict) -> str | None:
+    """Parse ?sort= (None: file order)"""
+    order = params.get("sort", [None])[0]
+    if not order:
+        return None
+    if order not in SORT_ORDERS:
+        raise BadRequestError(f"Unknown sort: {order}. Available: {', '.join(SORT_ORDERS)}")
+    return order
+
+
+def filter_session_mask(index: SessionIndex, params: dict) -> int:
+    """Bitset of the sessions matching the query parameters
+
+    Every filter narrows a bitset from the precomputed index, so combined
+    filters are plain intersections.
+    """
+    mask = index.all_mask
 
     # Filter by date
     date_filter = params.get("date", [None])[0]
     if date_filter:
-        filtered = [
-            s for s in filtered
-            if date_filter in s.get("date", "") or
-               (date_filter == "2025-11-25" and "Nov 25" in s.get("date", "")) or
-               (date_filter == "2025-11-26" and "Nov 26" in s.get("date", ""))
-        ]
+        mask &= select_values(index.dates, lambda value: date_matches(date_filter, value))
 
     # Filter by stage
     stage_filter = params.get("stage", [None])[0]
     if stage_filter:
-        filtered = [
-            s for s in filtered
-            if stage_filter.lower() in s.get("stage", "").lower()
-        ]
+        stage_lower = stage_filter.lower()
+        mask &= select_values(index.stages, lambda value: stage_lower in value)
 
     # Filter by time of day
     time_filter = params.get("time", [None])[0]
     if time_filter:
         if time_filter.lower() == "morning":
-            filtered = [
-                s for s in filtered
-                if parse_time(s.get("startTime", "12:00 PM")) < 720
-            ]
+            mask &= index.morning_mask
         elif time_filter.lower() == "afternoon":
-            filtered = [
-                s for s in filtered
-                if parse_time(s.get("startTime", "0:00 AM")) >= 720
-            ]
+            mask &= index.afternoon_mask
 
-    # Full-text search
+    # Full-text search through the n-gram index, tolerating typos when
+    # nothing in the dataset matches exactly
     search_filter = params.get("search", [None])[0]
-    if search_filter:
-        search_lower = search_filter.lower()
-        filtered = [
-            s for s in filtered
-            if search_lower in s.get("title", "").lower() or
-               any(
-                   search_lower in sp.get("name", "").lower() or
-                   search_lower in sp.get("company", "").lower() or
-                   search_lower in sp.get("title", "").lower()
-                   for sp in s.get("speakers", [])
-               ) or
-               any(search_lower in eco.lower() for eco in s.get("ecosystems", []))
-        ]
+    if search_filter and mask:
+        mask = match_session_search(index, search_filter, mask)
 
-    return filtered
+    return mask
+
+
+@dataclass
+class SpeakerIndex:
+    """Word index of a speakers list, for the typo-tolerant search fallback"""
+    speakers: list[Speaker]
+    words: dict[str, int]
+    word_grams: dict[str, list[str]]
+
+
+def build_speaker_index(speakers: list[Speaker]) -> SpeakerIndex:
+    """Build the word index of the speakers' search fields"""
+    words = build_word_index([
+        sp.search_fields if isinstance(sp, Speaker) else speaker_search_fields(sp)
+        for sp in speakers
+    ])
+    return SpeakerIndex(speakers=speakers, words=words, word_grams=build_word_grams(words))
+
+
+def get_speaker_index(speakers: list[Speaker]) -> SpeakerIndex:
+    """Return the word index of the speakers, kept while the list is the same"""
+    global _speakers_index
+    if _speakers_index is None or _speakers_index.speakers is not speakers:
+        _speakers_index = build_speaker_index(speakers)
+    return _speakers_index
 
 
-def filter_speakers(speakers: list[dict], params: dict) -> list[dict]:
-    """Filter speakers based on query parameters"""
+def count_facets(index: SessionIndex, mask: int, names: tuple[str, ...]) -> dict[str, dict[str, int]]:
+    """Number of sessions of mask per value of each facet, most frequent first
+
+    Values without any session in mask are left out.
+    """
+    counts = {}
+    for name in names:
+        values = [(value, (bits & mask).bit_count()) for value, bits in index.facets[name].items()]
+        values.sort(key=lambda item: (-item[1], item[0]))
+        counts[name] = {value: count for value, count in values if count}
+    return counts
+
+
+def parse_facets(params: dict, default: tuple[str, ...] = ()) -> tuple[str, ...]:
+    """Parse ?facets=a,b into facet names (default when absent)"""
+    facets_param = params.get("facets", [None])[0]
+    if not facets_param:
+        return default
+
+    requested = tuple(f.strip() for f in facets_param.split(",") if f.strip())
+    unknown = [f for f in requested if f not in FACETS]
+    if unknown:
+        raise BadRequestError(f"Unknown facet(s): {', '.join(unknown)}. Available: {', '.join(FACETS)}")
+    return requested
+
+
+def filter_speakers(speakers: list[Speaker], params: dict) -> list[Speaker]:
+    """Filter speakers based on query parameters
+
+    Raw speaker dicts are accepted too and searched without precomputed
+    fields. Searches without exact matches fall back to the typo-tolerant
+    word index.
+    """
     filtered = speakers.copy()
 
     search_filter = params.get("search", [None])[0]
     if search_filter:
-        search_lower = search_filter.lower()
-        filtered = [
-            sp for sp in filtered
-            if search_lower in sp.get("name", "").lower() or
-               search_lower in sp.get("company", "").lower() or
-               search_lower in sp.get("title", "").lower()
-        ]
+        filtered = search_speakers(speakers, search_filter)
+        if not filtered and speakers:
+            index = get_speaker_index(speakers)
+            mask = fuzzy_search(index.words, index.word_grams, search_filter, (1 << len(speakers)) - 1)
+            filtered = [speakers[pos] for pos in iter_bits(mask)]
 
     return filtered
 
 
+def search_speakers(speakers: list[Speaker], query: str) -> list[Speaker]:
+    """Speakers with query as a substring of a searchable field"""
+    query = fold(query)
+    return [
+        sp for sp in speakers
+        if any(
+            query in text
+            for text in (sp.search_fields if isinstance(sp, Speaker) else speaker_search_fields(sp))
+        )
+    ]
+
+
+def speaker_search_is_fuzzy(speakers: list[Speaker], params: dict) -> bool:
+    """Whether ?search= is answered by the typo-tolerant fallback"""
+    search_filter = params.get("search", [None])[0]
+    return bool(search_filter) and bool(speakers) and not search_speakers(speakers, search_filter)
+
+
+def slugify(name: str) -> str:
+    """URL slug of a speaker name: folded words joined by - ("Łukasz Ørsted" -> "łukasz-ørsted")
+
+    Letters without an ASCII form are kept, so the slug can be empty only
+    for names without any letter or digit. The typographic apostrophe is
+    dropped, as it was by the former ASCII-only slugs ("O’Brien" -> "obrien").
+    """
+    return "-".join(TOKEN_PATTERN.findall(fold(name).replace("’", "")))
+
+
+def speaker_session_ids(speaker: dict) -> list[str]:
+    """Session ids referenced by a speakers.json entry ({"sessionId": ...} or plain ids)"""
+    return [
+        ref.get("sessionId", "") if isinstance(ref, dict) else ref
+        for ref in speaker.get("sessions", [])
+    ]
+
+
+@dataclass
+class JoinIndex:
+    """Links between the cached sessions and speakers, by list position
+
+    Built from the sessionId references of speakers.json. The speakers of a
+    session keep the order in which the session lists them. Speakers whose
+    names share a slug get -2, -3... suffixes in file order, and names
+    without any letter or digit get speaker-<n> from their position in
+    speakers.json; speaker_slugs
+    is the slug of each speaker, and speaker_names maps exact names, looked
+    up first so that a URL-encoded name finds its own speaker.
+
+    The /sessions/{id} body of each session and its ETag are rendered with
+    the index, as session_bodies[pos] and session_etags[pos].
+    """
+    sessions: list[Session]
+    speakers: list[Speaker]
+    speaker_positions: dict[str, int]
+    speaker_slugs: list[str]
+    speaker_names: dict[str, int]
+    session_speakers: list[list[int]]
+    speaker_sessions: list[list[int]]
+    session_bodies: list[str]
+    session_etags: list[str]
+
+
+def build_join_index(sessions: list[Session], speakers: list[Speaker]) -> JoinIndex:
+    """Build the session <-> speaker join index"""
+    session_positions = get_session_index(sessions).positions
+
+    speaker_positions = {}
+    speaker_slugs = []
+    speaker_names = {}
+    for pos, speaker in enumerate(speakers):
+        slug = base = slugify(speaker.name) or f"speaker-{pos + 1}"
+        suffix = 2
+        while slug in speaker_positions:
+            slug = f"{base}-{suffix}"
+            suffix += 1
+        speaker_positions[slug] = pos
+        speaker_slugs.append(slug)
+        speaker_names.setdefault(speaker.name, pos)
+
+    session_speakers = [[] for _ in sessions]
+    speaker_sessions = []
+    for speaker_pos, speaker in enumerate(speakers):
+        linked = []
+        for session_id in speaker_session_ids(speaker.public):
+            session_pos = session_positions.get(session_id)
+            if session_pos is not None and session_pos not in linked:
+                linked.append(session_pos)
+                session_speakers[session_pos].append(speaker_pos)
+        speaker_sessions.append(linked)
+
+    for session_pos, linked in enumerate(session_speakers):
+        listed = [sp.get("name", "").casefold() for sp in sessions[session_pos].speakers]
+        linked.sort(key=lambda pos: (
+            listed.index(speakers[pos].name.casefold())
+            if speakers[pos].name.casefold() in listed else len(listed)
+        ))
+
+    session_bodies = [
+        encode_object([
+            ("session", session.fragment),
+            ("speakers", encode_array(speakers[sp].fragment for sp in linked)),
+        ])
+        for session, linked in zip(sessions, session_speakers)
+    ]
+
+    return JoinIndex(
+        sessions=sessions,
+        speakers=speakers,
+        speaker_positions=speaker_positions,
+        speaker_slugs=speaker_slugs,
+        speaker_names=speaker_names,
+        session_speakers=session_speakers,
+        speaker_sessions=speaker_sessions,
+        session_bodies=session_bodies,
+        session_etags=[compute_etag(body) for body in session_bodies],
+    )
+
+
+def get_join_index() -> JoinIndex:
+    """Return the join index of the cached data, rebuilt when either reloads"""
+    global _join_index
+    sessions = get_sessions()
+    speakers = get_speakers()
+    if _join_index is None or _join_index.sessions is not sessions or _join_index.speakers is not speakers:
+        _join_index = build_join_index(sessions, speakers)
+    return _join_index
+
+
+@dataclass
+class ColumnTable:
+    """Flattened columns of the cached sessions or speakers, one row per record
+
+    Built once per data version for the csv and arrow exports. `rows` maps
+    each record (by identity) to its row, `lines` holds the CSV line of every
+    row and `arrow` the same columns as a pyarrow Table (None without pyarrow).
+    """
+    records: list
+    columns: tuple[str, ...]
+    fields: tuple[str, ...]
+    rows: dict[int, int]
+    values: list[tuple]
+    header: str
+    lines: list[str]
+    arrow: Any
+
+
+def session_row(session: Session) -> tuple:
+    """Flattened SESSION_COLUMNS values of a session"""
+    public = session.public
+    speakers = public["speakers"]
+    return (
+        public["id"],
+        public["title"],
+        public["date"],
+        public["time"],
+        public["stage"],
+        MULTI_VALUE_SEPARATOR.join(sp.get("name", "") for sp in speakers),
+        MULTI_VALUE_SEPARATOR.join(sp.get("company", "") for sp in speakers),
+        MULTI_VALUE_SEPARATOR.join(sp.get("title", "") for sp in speakers),
+        MULTI_VALUE_SEPARATOR.join(public["ecosystems"]),
+    )
+
+
+def speaker_row(speaker: Speaker) -> tuple:
+    """Flattened SPEAKER_COLUMNS values of a speaker"""
+    public = speaker.public
+    linked = speaker_session_ids(public)
+    return (
+        public.get("name", ""),
+        public.get("initials", ""),
+        public.get("company", ""),
+        public.get("title", ""),
+        MULTI_VALUE_SEPARATOR.join(linked),
+        len(linked),
+    )
+
+
+def csv_line(values) -> str:
+    """One RFC 4180 CSV record, CRLF-terminated"""
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\r\n").writerow(values)
+    return buffer.getvalue()
+
+
+def build_column_table(records: list, columns: tuple[tuple[str, str], ...], flatten) -> ColumnTable:
+    """Flatten every record into a row and pre-encode the CSV lines and Arrow table"""
+    names = tuple(name for name, _ in columns)
+    values = [flatten(record) for record in records]
+    arrow = None
+    if pyarrow is not None:
+        arrow = pyarrow.table({name: [row[c] for row in values] for c, name in enumerate(names)})
+    return ColumnTable(
+        records=records,
+        columns=names,
+        fields=tuple(field for _, field in columns),
+        rows={id(record): pos for pos, record in enumerate(records)},
+        values=values,
+        header=csv_line(names),
+        lines=[csv_line(row) for row in values],
+        arrow=arrow,
+    )
+
+
+def get_session_columns(sessions: list[Session]) -> ColumnTable:
+    """Return the column table of the sessions, kept while the list is the same"""
+    global _session_columns
+    if _session_columns is None or _session_columns.records is not sessions:
+        _session_columns = build_column_table(sessions, SESSION_COLUMNS, session_row)
+    return _session_columns
+
+
+def get_speaker_columns(speakers: list[Speaker]) -> ColumnTable:
+    """Return the column table of the speakers, kept while the list is the same"""
+    global _speaker_columns
+    if _speaker_columns is None or _speaker_columns.records is not speakers:
+        _speaker_columns = build_column_table(speakers, SPEAKER_COLUMNS, speaker_row)
+    return _speaker_columns
+
+
 def create_response(status_code: int, body: Any, content_type: str = "application/json") -> dict:
     """Create HTTP response"""
     if content_type == "application/json":
         body_str = json.dumps(body, ensure_ascii=False)
-        content_type_header = "application/json; charset=utf-8"
     else:
         body_str = str(body)
-        content_type_header = f"{content_type}; charset=utf-8"
 
-    return {
+    return create_raw_response(status_code, body_str, content_type)
+
+
+def create_raw_response(
+    status_code: int,
+    body_str: str,
+    content_type: str = "application/json",
+    encoding: str | None = None,
+) -> dict:
+    """Create HTTP response from an already serialized body
+
+    When encoding is set, body_str must be the base64 of the compressed body,
+    and for binary content types the base64 of the encoded body.
+    """
+    binary = content_type in BINARY_ENCODERS or content_type == ARROW_CONTENT_TYPE
+    response = {
         "statusCode": status_code,
         "headers": {
-            "Content-Type": content_type_header,
+            "Content-Type": content_type if binary else f"{content_type}; charset=utf-8",
             "Access-Control-Allow-Origin": "*",
             "Access-Control-Allow-Methods": "GET, OPTIONS",
             "Access-Control-Allow-Headers": "Content-Type, Authorization",
         },
         "body": body_str,
     }
+    if encoding:
+        response["headers"]["Content-Encoding"] = encoding
+    if encoding or binary:
+        response["isBase64Encoded"] = True
+    return response
+
+
+def get_header(event: dict, name: str) -> str:
+    """Case-insensitive request header lookup"""
+    name = name.lower()
+    for key, value in (event.get("headers") or {}).items():
+        if key.lower() == name:
+            return value or ""
+    return ""
+
+
+def parse_qualities(header: str) -> dict[str, float]:
+    """Map each value of an Accept-style header to its q-value"""
+    qualities = {}
+    for part in header.split(","):
+        value, *options = part.split(";")
+        value = value.strip().lower()
+        if not value:
+            continue
+        q = 1.0
+        for option in options:
+            name, _, number = option.strip().partition("=")
+            if name.lower() == "q":
+                try:
+                    q = float(number)
+                except ValueError:
+                    q = 0.0
+        qualities[value] = q
+    return qualities
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """Pick the response encoding from an Accept-Encoding header
+
+    Returns "br" (only when brotli is installed), "gzip", or None for identity.
+    """
+    qualities = parse_qualities(accept_encoding)
+    wildcard = qualities.get("*", 0.0)
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best = None
+    best_q = 0.0
+    for coding in candidates:
+        q = qualities.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def negotiate_media_type(accept: str) -> str:
+    """Pick the media type of JSON endpoints from an Accept header
+
+    A binary type is only chosen when the client lists it explicitly and ranks
+    it at least as high as JSON; wildcards and a missing header mean JSON.
+    """
+    qualities = {}
+    for media_type, q in parse_qualities(accept).items():
+        media_type = MEDIA_TYPE_ALIASES.get(media_type, media_type)
+        qualities[media_type] = max(q, qualities.get(media_type, 0.0))
+
+    json_q = qualities.get(
+        "application/json", qualities.get("application/*", qualities.get("*/*", 0.0))
+    )
+    best = "application/json"
+    best_q = 0.0
+    for media_type in BINARY_ENCODERS:
+        q = qualities.get(media_type, 0.0)
+        if q > best_q and q >= json_q:
+            best, best_q = media_type, q
+    return best
+
+
+def compress_body(body: str | bytes, encoding: str) -> str:
+    """Compress a body and base64-encode it for the Lambda response payload"""
+    data = body.encode("utf-8") if isinstance(body, str) else body
+    if encoding == "br":
+        data = brotli.compress(data)
+    else:
+        # mtime=0 keeps the output identical for identical bodies
+        data = gzip.compress(data, compresslevel=6, mtime=0)
+    return base64.b64encode(data).decode("ascii")
+
+
+def response_cache_key(path: str, params: dict) -> tuple:
+    """Build a cache key that ignores query parameter order"""
+    return (path, tuple(sorted((k, tuple(v)) for k, v in params.items())))
+
+
+def clear_response_cache() -> None:
+    """Drop every cached body (called whenever a data cache reloads)"""
+    global _response_cache_bytes
+    _response_cache.clear()
+    _response_cache_bytes = 0
+
+
+def get_cached_body(key: tuple) -> str | None:
+    """Return a cached body and mark it as most recently used"""
+    body_str = _response_cache.get(key)
+    if body_str is not None:
+        _response_cache.move_to_end(key)
+    return body_str
+
+
+def put_cached_body(key: tuple, body_str: str) -> None:
+    """Cache a body, evicting least recently used entries over the size budget"""
+    global _response_cache_bytes
+    size = len(body_str)
+    if size > RESPONSE_CACHE_MAX_BYTES:
+        return
+
+    previous = _response_cache.pop(key, None)
+    if previous is not None:
+        _response_cache_bytes -= len(previous)
+
+    _response_cache[key] = body_str
+    _response_cache_bytes += size
+
+    while _response_cache_bytes > RESPONSE_CACHE_MAX_BYTES:
+        _, evicted = _response_cache.popitem(last=False)
+        _response_cache_bytes -= len(evicted)
+
+
+def cached_response(
+    path: str,
+    params: dict,
+    render,
+    encoding: str | None = None,
+    content_type: str = "application/json",
+) -> dict:
+    """Serve a rendered body from the response cache, rendering it on a miss
+
+    Compressed and binary variants are cached next to the plain body under their own key.
+    """
+    key = response_cache_key(path, params)
+    body_str = get_cached_body(key)
+    if body_str is None:
+        body_str = render()
+        put_cached_body(key, body_str)
+
+    etag_key = key + ("etag",)
+    etag = get_cached_body(etag_key)
+    if etag is None:
+        etag = compute_etag(body_str)
+        put_cached_body(etag_key, etag)
+
+    return prerendered_response(key, body_str, etag, encoding, content_type)
+
+
+def prerendered_response(
+    key: tuple,
+    body_str: str,
+    etag: str,
+    encoding: str | None = None,
+    content_type: str = "application/json",
+) -> dict:
+    """Response for an already rendered body and its ETag
+
+    A binary content_type turns the JSON body into that variant, cached under
+    key + (content_type,). Compressed variants are cached in the response
+    cache under key + (encoding,), or key + (content_type, encoding).
+    """
+    if content_type in BINARY_ENCODERS:
+        key += (content_type,)
+        payload = get_cached_body(key)
+        if payload is None:
+            payload = encode_binary_body(body_str, content_type)
+            put_cached_body(key, payload)
+        body = base64.b64decode(payload)
+        etag = variant_etag(etag, content_type)
+    elif content_type == ARROW_CONTENT_TYPE:
+        # Rendered as base64 already
+        payload, body = body_str, base64.b64decode(body_str)
+    else:
+        payload = body = body_str
+
+    if not encoding or len(body) < MIN_COMPRESS_BYTES:
+        response = create_raw_response(200, payload, content_type)
+    else:
+        encoded_key = key + (encoding,)
+        encoded = get_cached_body(encoded_key)
+        if encoded is None:
+            encoded = compress_body(body, encoding)
+            put_cached_body(encoded_key, encoded)
+        response = create_raw_response(200, encoded, content_type, encoding=encoding)
+
+    response["headers"]["Vary"] = "Accept-Encoding, Accept"
+    response["headers"]["ETag"] = etag
+    return response
+
+
+def encode_binary_body(body_str: str, media_type: str) -> str:
+    """Re-encode a JSON body as media_type, base64-encoded for the response payload"""
+    return base64.b64encode(BINARY_ENCODERS[media_type](json.loads(body_str))).decode("ascii")
+
+
+def variant_etag(etag: str, media_type: str) -> str:
+    """ETag of a binary variant, distinct from the JSON body it was encoded from"""
+    return f'{etag[:-1]}-{media_type.rpartition("/")[2]}"'
+
+
+def compute_etag(body_str: str) -> str:
+    """Content-hash ETag of the uncompressed body
+
+    Weak, so that the gzip/br variants of a body share the same validator.
+    """
+    digest = hashlib.blake2b(body_str.encode("utf-8"), digest_size=16).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def apply_validators(response: dict, if_none_match: str) -> dict:
+    """Add an ETag to successful responses and answer 304 when it matches"""
+    if response["statusCode"] != 200:
+        return response
+
+    headers = response["headers"]
+    if "ETag" not in headers:
+        headers["ETag"] = compute_etag(response["body"])
+
+    if not etag_matches(if_none_match, headers["ETag"]):
+        return response
+
+    not_modified = {
+        name: value for name, value in headers.items()
+        if name not in ("Content-Type", "Content-Encoding")
+    }
+    return {"statusCode": 304, "headers": not_modified, "body": ""}
+
+
+def msgpack_encode(value: Any) -> bytes:
+    """MessagePack encoding of a JSON-compatible value"""
+    out = bytearray()
+    _pack_msgpack(value, out)
+    return bytes(out)
+
+
+def _pack_msgpack(value: Any, out: bytearray) -> None:
+    if value is None:
+        out.append(0xC0)
+    elif value is True:
+        out.append(0xC3)
+    elif value is False:
+        out.append(0xC2)
+    elif isinstance(value, int):
+        if 0 <= value < 0x80 or -32 <= value < 0:
+            out += struct.pack(">b" if value < 0 else ">B", value)
+        elif value >= 0:
+            for limit, marker, fmt in ((0x100, 0xCC, ">B"), (0x10000, 0xCD, ">H"), (1 << 32, 0xCE, ">I")):
+                if value < limit:
+                    out.append(marker)
+                    out += struct.pack(fmt, value)
+                    break
+            else:
+                out.append(0xCF)
+                out += struct.pack(">Q", value)
+        else:
+            for limit, marker, fmt in ((1 << 7, 0xD0, ">b"), (1 << 15, 0xD1, ">h"), (1 << 31, 0xD2, ">i")):
+                if value >= -limit:
+                    out.append(marker)
+                    out += struct.pack(fmt, value)
+                    break
+            else:
+                out.append(0xD3)
+                out += struct.pack(">q", value)
+    elif isinstance(value, float):
+        out.append(0xCB)
+        out += struct.pack(">d", value)
+    elif isinstance(value, str):
+        data = value.encode("utf-8")
+        _pack_msgpack_head(len(data), out, 0xA0, 32, (0xD9, 0xDA, 0xDB))
+        out += data
+    elif isinstance(value, (list, tuple)):
+        _pack_msgpack_head(len(value), out, 0x90, 16, (None, 0xDC, 0xDD))
+        for item in value:
+            _pack_msgpack(item, out)
+    elif isinstance(value, dict):
+        _pack_msgpack_head(len(value), out, 0x80, 16, (None, 0xDE, 0xDF))
+        for name, item in value.items():
+            _pack_msgpack(name, out)
+            _pack_msgpack(item, out)
+    else:
+        raise TypeError(f"Cannot encode {type(value).__name__} as MessagePack")
+
+
+def _pack_msgpack_head(length: int, out: bytearray, fix: int, fix_limit: int, markers: tuple) -> None:
+    """Length prefix of a MessagePack str/array/map: fix form, then 8/16/32-bit"""
+    if length < fix_limit:
+        out.append(fix | length)
+    elif length < 0x100 and markers[0] is not None:
+        out.append(markers[0])
+        out.append(length)
+    elif length < 0x10000:
+        out.append(markers[1])
+        out += struct.pack(">H", length)
+    else:
+        out.append(markers[2])
+        out += struct.pack(">I", length)
+
+
+def cbor_encode(value: Any) -> bytes:
+    """CBOR (RFC 8949) encoding of a JSON-compatible value"""
+    out = bytearray()
+    _pack_cbor(value, out)
+    return bytes(out)
+
+
+def _pack_cbor(value: Any, out: bytearray) -> None:
+    if value is None:
+        out.append(0xF6)
+    elif value is True:
+        out.append(0xF5)
+    elif value is False:
+        out.append(0xF4)
+    elif isinstance(value, int):
+        if value >= 0:
+            _pack_cbor_head(0, value, out)
+        else:
+            _pack_cbor_head(1, -1 - value, out)
+    elif isinstance(value, float):
+        out.append(0xFB)
+        out += struct.pack(">d", value)
+    elif isinstance(value, str):
+        data = value.encode("utf-8")
+        _pack_cbor_head(3, len(data), out)
+        out += data
+    elif isinstance(value, (list, tuple)):
+        _pack_cbor_head(4, len(value), out)
+        for item in value:
+            _pack_cbor(item, out)
+    elif isinstance(value, dict):
+        _pack_cbor_head(5, len(value), out)
+        for name, item in value.items():
+            _pack_cbor(name, out)
+            _pack_cbor(item, out)
+    else:
+        raise TypeError(f"Cannot encode {type(value).__name__} as CBOR")
+
+
+def _pack_cbor_head(major: int, argument: int, out: bytearray) -> None:
+    """Initial byte of a CBOR data item and its 0/1/2/4/8-byte argument"""
+    if argument < 24:
+        out.append(major << 5 | argument)
+        return
+    for info, fmt in ((24, ">B"), (25, ">H"), (26, ">I"), (27, ">Q")):
+        if argument < 1 << (8 * struct.calcsize(fmt)):
+            out.append(major << 5 | info)
+            out += struct.pack(fmt, argument)
+            return
+    raise ValueError("CBOR integers are limited to 64 bits")
+
+
+# Encoders of the binary media types, by the media type they produce
+BINARY_ENCODERS = {
+    MSGPACK_CONTENT_TYPE: msgpack_encode,
+    CBOR_CONTENT_TYPE: cbor_encode,
+}
+
+
+def format_session(session: dict) -> dict:
+    """Public projection of a sessions.json entry (built once per Session)"""
+    start = session.get("startTime", "")
+    end = session.get("endTime", "")
+    time_str = f"{start} - {end}".strip(" -") if start or end else ""
+    return {
+        "id": session.get("id", ""),
+        "title": session.get("title", ""),
+        "date": session.get("date", ""),
+        "time": time_str,
+        "stage": session.get("stage", ""),
+        "speakers": session.get("speakers", []),
+        "ecosystems": session.get("ecosystems", []),
+    }
+
+
+def ics_escape(text: str) -> str:
+    """Escape a TEXT value (RFC 5545 3.3.11)"""
+    return (
+        text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+        .replace("\r\n", "\\n").replace("\n", "\\n")
+    )
+
+
+def ics_line(name: str, value: str) -> str:
+    """Content line folded at 75 octets, without splitting UTF-8 characters"""
+    line = f"{name}:{value}"
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return line + "\r\n"
+
+    parts = []
+    start = 0
+    limit = 75
+    while len(data) - start > limit:
+        end = start + limit
+        # Back off to the first byte of a multi-byte character
+        while data[end] & 0xC0 == 0x80:
+            end -= 1
+        parts.append(data[start:end])
+        start, limit = end, 74
+    parts.append(data[start:])
+    return b"\r\n ".join(parts).decode("utf-8") + "\r\n"
+
+
+def ics_time(dt: datetime) -> str:
+    """UTC DATE-TIME value"""
+    return dt.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def format_vevent(session: dict, start_dt: datetime | None, end_dt: datetime | None) -> str:
+    """VEVENT of a sessions.json entry (built once per Session)
+
+    Sessions without a valid end time last FALLBACK_DURATION, as in
+    ?now=true. DTSTAMP is the start time so that the export only changes
+    with the data.
+    """
+    if start_dt is None:
+        return ""
+    if end_dt is None or end_dt <= start_dt:
+        end_dt = start_dt + FALLBACK_DURATION
+
+    speakers = [
+        f"{sp.get('name', '')} ({sp['company']})" if sp.get("company") else sp.get("name", "")
+        for sp in session.get("speakers", [])
+    ]
+    description = []
+    if speakers:
+        description.append("Speakers: " + ", ".join(speakers))
+    if session.get("ecosystems"):
+        description.append("Ecosystems: " + ", ".join(session["ecosystems"]))
+
+    lines = [
+        "BEGIN:VEVENT\r\n",
+        ics_line("UID", f"{session.get('id', '')}@adoptai.codecrafter.fr"),
+        ics_line("DTSTAMP", ics_time(start_dt)),
+        ics_line("DTSTART", ics_time(start_dt)),
+        ics_line("DTEND", ics_time(end_dt)),
+        ics_line("SUMMARY", ics_escape(session.get("title", ""))),
+        ics_line("LOCATION", ics_escape(session.get("stage", "") + ICS_LOCATION_SUFFIX)),
+    ]
+    if description:
+        lines.append(ics_line("DESCRIPTION", ics_escape("\n".join(description))))
+    if session.get("url"):
+        lines.append(ics_line("URL", session["url"]))
+    lines.append("END:VEVENT\r\n")
+    return "".join(lines)
+
+
+def render_ics(records: list[Session], params: dict) -> str:
+    """iCalendar export of the selected sessions, concatenating their VEVENTs"""
+    page, _, _ = select_page(records, params)
+    return ICS_HEADER + "".join(session.vevent for session in page) + ICS_FOOTER
+
+
+def parse_fields(params: dict, allowed: tuple[str, ...]) -> tuple[str, ...] | None:
+    """Parse ?fields=a,b into the projected field names (None: all fields)"""
+    fields_param = params.get("fields", [None])[0]
+    if not fields_param:
+        return None
+
+    requested = tuple(f.strip() for f in fields_param.split(",") if f.strip())
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise BadRequestError(
+            f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(allowed)}"
+        )
+    return requested
+
+
+def parse_page(params: dict) -> tuple[int, int | None]:
+    """Parse ?cursor= and ?limit= into (offset, limit); limit None means no paging"""
+    limit_param = params.get("limit", [None])[0]
+    cursor_param = params.get("cursor", [None])[0]
+
+    limit = None
+    if limit_param is not None:
+        if not limit_param.isdecimal() or not 1 <= int(limit_param) <= MAX_PAGE_SIZE:
+            raise BadRequestError(f"limit must be an integer between 1 and {MAX_PAGE_SIZE}")
+        limit = int(limit_param)
+
+    offset = 0
+    if cursor_param is not None:
+        if not cursor_param.isdecimal():
+            raise BadRequestError("cursor must be a value returned as nextCursor")
+        offset = int(cursor_param)
+
+    return offset, limit
+
+
+def select_page(records: list, params: dict) -> tuple[list, int, int | None]:
+    """Slice filtered records to the requested page: (page, offset, limit)"""
+    offset, limit = parse_page(params)
+    page = records[offset:] if limit is None else records[offset:offset + limit]
+    return page, offset, limit
+
+
+def record_members(record: Session | Speaker) -> dict[str, str]:
+    """Encoded '"name": value' members of a record's public fields, kept on the record"""
+    if record.members is None:
+        record.members = {
+            name: f"{json.dumps(name, ensure_ascii=False)}: {json.dumps(value, ensure_ascii=False)}"
+            for name, value in record.public.items()
+        }
+    return record.members
+
+
+def encode_records(page: list, fields: tuple[str, ...] | None) -> list[str]:
+    """JSON encoding of each record: its precomputed fragment, or its projected members"""
+    if fields is None:
+        return [r.fragment for r in page]
+    encoded = []
+    for record in page:
+        members = record_members(record)
+        encoded.append("{" + ", ".join(members[f] for f in fields if f in members) + "}")
+    return encoded
+
+
+def encode_array(items) -> str:
+    """JSON array from already-encoded items, laid out like json.dumps"""
+    return "[" + ", ".join(items) + "]"
+
+
+def encode_object(members: list[tuple[str, str]]) -> str:
+    """JSON object from (name, already-encoded value) pairs, laid out like json.dumps"""
+    return "{" + ", ".join(f"{json.dumps(name, ensure_ascii=False)}: {value}" for name, value in members) + "}"
+
+
+def build_list_members(
+    records: list,
+    params: dict,
+    key: str,
+    allowed: tuple[str, ...],
+    matched: int | None = None,
+) -> list[tuple[str, str]]:
+    """Page and project filtered records into the encoded key/count members
+
+    Without ?limit= every record is returned and the body keeps its original
+    shape; with it, `matched` and `nextCursor` (null on the last page) are added.
+    matched defaults to len(records), for callers that pass every match.
+    """
+    fields = parse_fields(params, allowed)
+    page, offset, limit = select_page(records, params)
+    if matched is None:
+        matched = len(records)
+
+    members = [
+        ("count", str(len(page))),
+        (key, encode_array(encode_records(page, fields))),
+    ]
+    if limit is not None:
+        members.append(("matched", str(matched)))
+        members.append(("nextCursor", json.dumps(next_cursor(offset, len(page), matched))))
+    return members
+
+
+def next_cursor(offset: int, count: int, matched: int) -> str | None:
+    """Cursor of the page after the count records at offset (None on the last page)"""
+    end = offset + count
+    return str(end) if end < matched else None
+
+
+def build_sessions_body(sessions: list[Session], params: dict) -> str:
+    """Serialized /sessions body with regular filters"""
+    selected, matched = select_sessions(sessions, params)
+    count, *listing = build_list_members(selected, params, "sessions", SESSION_FIELDS, matched)
+    index = get_session_index(sessions)
+    facet_names = parse_facets(params)
+    if facet_names:
+        facets = count_facets(index, filter_session_mask(index, params), facet_names)
+        listing.append(("facets", json.dumps(facets, ensure_ascii=False)))
+    if session_search_is_fuzzy(index, params):
+        listing.insert(0, ("fuzzy", "true"))
+    filters = {k: v[0] for k, v in params.items() if v}
+    return encode_object([
+        ("total", str(len(sessions))),
+        count,
+        ("filters", json.dumps(filters, ensure_ascii=False)),
+        *listing,
+    ])
+
+
+def build_facets_body(sessions: list[Session], params: dict) -> str:
+    """Serialized /facets body: facet counts of the sessions matching the filters"""
+    index = get_session_index(sessions)
+    mask = filter_session_mask(index, params)
+    body = {
+        "total": len(sessions),
+        "count": mask.bit_count(),
+        "filters": {k: v[0] for k, v in params.items() if v},
+        "facets": count_facets(index, mask, parse_facets(params, DEFAULT_FACETS)),
+    }
+    if session_search_is_fuzzy(index, params):
+        body["fuzzy"] = True
+    return json.dumps(body, ensure_ascii=False)
+
+
+def build_speakers_body(speakers: list[Speaker], params: dict) -> str:
+    """Serialized /speakers body"""
+    filtered = filter_speakers(speakers, params)
+    count, *listing = build_list_members(filtered, params, "speakers", SPEAKER_FIELDS)
+    if speaker_search_is_fuzzy(speakers, params):
+        listing.insert(0, ("fuzzy", "true"))
+    return encode_object([count, *listing])
+
+
+def parse_since(params: dict) -> tuple[str, str] | None:
+    """Parse ?since= into its (sessions, speakers) versions (None: since empty data)"""
+    since = params.get("since", [None])[0]
+    if not since:
+        return None
+    sessions_version, dot, speakers_version = since.partition(".")
+    if not dot or not sessions_version or not speakers_version:
+        raise BadRequestError("since must be a version returned by /changes")
+    return sessions_version, speakers_version
+
+
+def known_version(since: tuple[str, str]) -> bool:
+    """Whether both halves of a ?since= version are still in the history"""
+    return all(
+        version in _data_history.get(name, {})
+        for name, version in zip(("sessions", "speakers"), since)
+    )
+
+
+def diff_members(name: str, records: list, since_version: str | None) -> tuple[str, int]:
+    """Encoded added/modified/removed lists of one data file since a version, and their size"""
+    history = _data_history[name]
+    old = history[since_version] if since_version is not None else {}
+    new = history[_data_versions[name]]
+    added = []
+    modified = []
+    for record in records:
+        key = record_key(record)
+        if key not in old:
+            added.append(record.fragment)
+        elif old[key] != new[key]:
+            modified.append(record.fragment)
+    removed = [key for key in old if key not in new]
+    return encode_object([
+        ("added", encode_array(added)),
+        ("modified", encode_array(modified)),
+        ("removed", json.dumps(removed, ensure_ascii=False)),
+    ]), len(added) + len(modified) + len(removed)
+
+
+def build_changes_body(sessions: list[Session], speakers: list[Speaker], since: tuple[str, str] | None) -> str:
+    """Serialized /changes body: records added, modified and removed since a version
+
+    Without since, every current record is reported as added.
+    """
+    sessions_members, sessions_count = diff_members("sessions", sessions, since and since[0])
+    speakers_members, speakers_count = diff_members("speakers", speakers, since and since[1])
+    return encode_object([
+        ("since", json.dumps(".".join(since) if since else None)),
+        ("version", json.dumps(get_data_version())),
+        ("count", str(sessions_count + speakers_count)),
+        ("sessions", sessions_members),
+        ("speakers", speakers_members),
+    ])
+
+
+def render_ndjson(records: list, params: dict, allowed: tuple[str, ...]) -> str:
+    """One JSON record per line, without the envelope"""
+    fields = parse_fields(params, allowed)
+    page, _, _ = select_page(records, params)
+    return "".join(line + "\n" for line in encode_records(page, fields))
+
+
+def render_columnar(
+    table: ColumnTable,
+    records: list,
+    params: dict,
+    allowed: tuple[str, ...],
+    output: str,
+) -> str:
+    """csv or arrow export of the selected records, from their pre-built rows
+
+    ?fields= keeps the columns flattened from those fields. Arrow bodies are
+    returned base64-encoded, like the other binary bodies.
+    """
+    if output == "arrow" and table.arrow is None:
+        raise BadRequestError("format=arrow is not available on this deployment")
+    fields = parse_fields(params, allowed)
+    page, _, _ = select_page(records, params)
+    rows = [table.rows[id(record)] for record in page]
+    if fields is None:
+        columns = list(range(len(table.columns)))
+    else:
+        columns = [c for f in fields for c, field in enumerate(table.fields) if field == f]
+
+    if output == "arrow":
+        selected = table.arrow.take(rows).select(columns)
+        sink = pyarrow.BufferOutputStream()
+        with pyarrow.ipc.new_stream(sink, selected.schema) as writer:
+            writer.write_table(selected)
+        return base64.b64encode(sink.getvalue().to_pybytes()).decode("ascii")
+
+    if fields is None:
+        return table.header + "".join(table.lines[r] for r in rows)
+    return csv_line(table.columns[c] for c in columns) + "".join(
+        csv_line(table.values[r][c] for c in columns) for r in rows
+    )
+
+
+def build_speaker_detail_body(join: JoinIndex, pos: int) -> str:
+    """Serialized /speakers/{slug} body: the speaker and their full sessions"""
+    return encode_object([
+        ("speaker", join.speakers[pos].fragment),
+        ("sessions", encode_array(join.sessions[s].fragment for s in join.speaker_sessions[pos])),
+    ])
+
+
+def build_speaker_sessions_body(join: JoinIndex, pos: int) -> str:
+    """Serialized /speakers/{slug}/sessions body"""
+    linked = join.speaker_sessions[pos]
+    return encode_object([
+        ("speaker", json.dumps(join.speakers[pos].name, ensure_ascii=False)),
+        ("count", str(len(linked))),
+        ("sessions", encode_array(join.sessions[s].fragment for s in linked)),
+    ])
+
+
+def parse_batch(params: dict) -> list[tuple[str, str, dict]]:
+    """Parse the ?q= sub-queries of /batch into (key, path, params)
+
+    A sub-query is a URL-encoded /sessions query string ("stage=CEO Stage&
+    time=morning"), or a path and query ("/speakers?search=Anthropic").
+    """
+    queries = params.get("q", [])
+    if not queries:
+        raise BadRequestError("Pass each query as a URL-encoded q parameter")
+    if len(queries) > MAX_BATCH_QUERIES:
+        raise BadRequestError(f"At most {MAX_BATCH_QUERIES} queries per batch")
+
+    parsed = []
+    for key in dict.fromkeys(queries):
+        path, _, query = key.partition("?") if key.startswith("/") else ("/sessions", "?", key)
+        if path not in BATCH_PATHS:
+            raise BadRequestError(f"Unsupported batch path: {path}. Available: {', '.join(BATCH_PATHS)}")
+        sub_params = parse_qs(query)
+        unsupported = [name for name in ("now", "fields", "format") if name in sub_params]
+        if unsupported:
+            raise BadRequestError(f"Not supported in /batch: {', '.join(unsupported)}")
+        parsed.append((key, path, sub_params))
+    return parsed
+
+
+def build_batch_body(params: dict) -> str:
+    """Serialized /batch body
+
+    Each sub-query result lists session ids or speaker names; the records
+    themselves are returned once, in the shared `sessions` and `speakers`
+    maps, however many results include them.
+    """
+    results = []
+    shared_sessions: dict[str, str] = {}
+    shared_speakers: dict[str, str] = {}
+
+    for key, path, sub_params in parse_batch(params):
+        if path == "/sessions":
+            sessions = get_sessions()
+            selected, matched = select_sessions(sessions, sub_params)
+            page, offset, limit = select_page(selected, sub_params)
+            result = {
+                "total": len(sessions),
+                "count": len(page),
+                "filters": {k: v[0] for k, v in sub_params.items() if v},
+                "sessions": [session.id for session in page],
+            }
+            index = get_session_index(sessions)
+            facet_names = parse_facets(sub_params)
+            if facet_names:
+                result["facets"] = count_facets(index, filter_session_mask(index, sub_params), facet_names)
+            if session_search_is_fuzzy(index, sub_params):
+                result["fuzzy"] = True
+            for session in page:
+                shared_sessions.setdefault(session.id, session.fragment)
+        else:
+            speakers = get_speakers()
+            filtered = filter_speakers(speakers, sub_params)
+            page, offset, limit = select_page(filtered, sub_params)
+            matched = len(filtered)
+            result = {
+                "count": len(page),
+                "speakers": [speaker.name for speaker in page],
+            }
+            if speaker_search_is_fuzzy(speakers, sub_params):
+                result["fuzzy"] = True
+            for speaker in page:
+                shared_speakers.setdefault(speaker.name, speaker.fragment)
+
+        if limit is not None:
+            result["matched"] = matched
+            result["nextCursor"] = next_cursor(offset, len(page), matched)
+        results.append((key, json.dumps(result, ensure_ascii=False)))
+
+    return encode_object([
+        ("results", encode_object(results)),
+        ("sessions", encode_object(list(shared_sessions.items()))),
+        ("speakers", encode_object(list(shared_speakers.items()))),
+    ])
+
+
+def schedule_sessions(index: SessionIndex, weights: dict[int, float], buffer_seconds: float) -> list[int]:
+    """Heaviest set of non-overlapping sessions among weights, in time order
+
+    Weighted interval scheduling over the interval index: sessions are
+    taken by end time, and the best schedule ending with each one is its
+    weight plus the best schedule ending early enough before it. That is
+    buffer_seconds before its start when changing stage, or at its start on
+    the same stage. Both lookups are bisections over running maxima (global
+    and per stage), so the whole is O(n log n).
+    """
+    timed = sorted(
+        (end, start, pos)
+        for start, pos, end in zip(index.start_times, index.start_positions, index.end_times)
+        if pos in weights
+    )
+
+    ends: list[float] = []
+    best: list[tuple[float, int]] = []
+    stage_ends: dict[str, list[float]] = {}
+    stage_best: dict[str, list[tuple[float, int]]] = {}
+    previous: list[int] = []
+
+    for j, (end, start, pos) in enumerate(timed):
+        stage = index.sessions[pos].stage
+        before = (0.0, -1)
+        k = bisect.bisect_right(ends, start - buffer_seconds)
+        if k:
+            before = max(before, best[k - 1])
+        if stage in stage_ends:
+            k = bisect.bisect_right(stage_ends[stage], start)
+            if k:
+                before = max(before, stage_best[stage][k - 1])
+
+        entry = (weights[pos] + before[0], j)
+        previous.append(before[1])
+        ends.append(end)
+        best.append(max(best[-1], entry) if best else entry)
+        if stage:
+            stage_ends.setdefault(stage, []).append(end)
+            running = stage_best.setdefault(stage, [])
+            running.append(max(running[-1], entry) if running else entry)
+
+    schedule = []
+    j = best[-1][1] if best else -1
+    while j >= 0:
+        schedule.append(timed[j][2])
+        j = previous[j]
+    return schedule[::-1]
+
+
+def find_conflict(index: SessionIndex, pos: int, schedule: list[int], buffer_seconds: float) -> int | None:
+    """First scheduled session that leaves no room for the session at pos"""
+    intervals = {p: (start, end) for start, p, end in zip(index.start_times, index.start_positions, index.end_times)}
+    start, end = intervals[pos]
+    stage = index.sessions[pos].stage
+    for other in schedule:
+        other_start, other_end = intervals[other]
+        gap = 0 if stage and index.sessions[other].stage == stage else buffer_seconds
+        if other_start < end + gap and start < other_end + gap:
+            return other
+    return None
+
+
+def build_itinerary_body(sessions: list[Session], params: dict) -> str:
+    """Serialized /itinerary body
+
+    Candidates are the requested ?ids= and the sessions matching any of the
+    ?interests= keywords, narrowed by date/stage/time. Requested sessions
+    outweigh interest matches, which weigh 1 plus their relevance score.
+    """
+    index = get_session_index(sessions)
+
+    ids = [i.strip() for i in params.get("ids", [""])[0].split(",") if i.strip()]
+    interests = [k.strip() for k in params.get("interests", [""])[0].split(",") if k.strip()]
+    if not ids and not interests:
+        raise BadRequestError("Pass session ids (ids=a,b) and/or interests (interests=banking,health)")
+    unknown = [i for i in ids if i not in index.positions]
+    if unknown:
+        raise BadRequestError(f"Unknown session id(s): {', '.join(unknown)}")
+
+    buffer_param = params.get("buffer", [str(TRAVEL_BUFFER_MINUTES)])[0]
+    if not buffer_param.isdecimal() or int(buffer_param) > MAX_TRAVEL_BUFFER_MINUTES:
+        raise BadRequestError(f"buffer must be a number of minutes between 0 and {MAX_TRAVEL_BUFFER_MINUTES}")
+    buffer_seconds = int(buffer_param) * 60
+
+    allowed = filter_session_mask(index, {k: v for k, v in params.items() if k in ("date", "stage", "time")})
+    weights: dict[int, float] = {}
+    fuzzy = []
+    for keyword in interests:
+        if not search_sessions(index, keyword):
+            fuzzy.append(keyword)
+        matches = match_session_search(index, keyword, allowed)
+        scores = score_sessions(index, keyword)
+        for pos in iter_bits(matches):
+            weights[pos] = weights.get(pos, 0.0) + 1.0 + scores.get(pos, 0.0)
+    requested = [index.positions[i] for i in dict.fromkeys(ids)]
+    for pos in requested:
+        weights[pos] = weights.get(pos, 0.0) + REQUESTED_SESSION_WEIGHT
+
+    schedule = schedule_sessions(index, weights, buffer_seconds)
+    scheduled = set(schedule)
+    conflicts = []
+    for pos in requested:
+        if pos in scheduled:
+            continue
+        other = find_conflict(index, pos, schedule, buffer_seconds) if sessions[pos].start_dt else None
+        conflicts.append(json.dumps({
+            "id": sessions[pos].id,
+            "title": sessions[pos].title,
+            "conflictsWith": sessions[other].id if other is not None else None,
+        }, ensure_ascii=False))
+
+    filters = {k: v[0] for k, v in params.items() if v}
+    members = [
+        ("filters", json.dumps(filters, ensure_ascii=False)),
+        ("bufferMinutes", str(buffer_seconds // 60)),
+        ("count", str(len(schedule))),
+        ("sessions", encode_array(sessions[pos].fragment for pos in schedule)),
+        ("conflicts", encode_array(conflicts)),
+    ]
+    if fuzzy:
+        # Interests answered by the typo-tolerant fallback
+        members.append(("fuzzyInterests", json.dumps(fuzzy, ensure_ascii=False)))
+    return encode_object(members)
+
+
+def not_found_response(message: str) -> dict:
+    """404 for an unknown session or speaker"""
+    response = create_response(404, {"error": "Not Found", "message": message})
+    response["headers"]["Cache-Control"] = DATA_CACHE_CONTROL
+    return response
+
+
+def parse_format(params: dict, formats: tuple[str, ...]) -> str:
+    """Parse ?format= among the formats of an endpoint (default json)"""
+    output = params.get("format", ["json"])[0] or "json"
+    if output not in formats:
+        raise BadRequestError(
+            f"Unknown format: {output}. Available: {', '.join(formats)}"
+        )
+    return output
+
+
+def fetch_if_modified(key: str, etag: str) -> tuple[bytes | None, str]:
+    """Conditional GET: returns (None, etag) when the object still has that ETag"""
+    try:
+        response = s3_client.get_object(Bucket=BUCKET_NAME, Key=key, IfNoneMatch=etag)
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("304", "NotModified"):
+            return None, etag
+        raise
+    return response["Body"].read(), response.get("ETag", "")
+
+
+def refresh_data() -> None:
+    """Check sessions.json and speakers.json for changes and rebuild what changed
+
+    Changed objects are downloaded with If-None-Match, so unchanged data costs
+    a 304. Rebuilt data goes to _pending_data and is swapped in by
+    install_pending_data() between requests. Data loaded from a snapshot
+    starts from the ETag of the raw file it was compiled from, so a fix
+    uploaded after the deploy is seen by the first check.
+    """
+    builders = {
+        "sessions": sessions_from_json,
+        "speakers": speakers_from_json,
+    }
+    for name, build in builders.items():
+        key = f"{DATA_PREFIX}/{name}.json"
+        etag = _data_etags.get(key)
+        if etag is None:
+            # Not loaded yet: the first request that needs it loads it
+            continue
+
+        body, new_etag = fetch_if_modified(key, etag)
+        if body is None:
+            continue
+
+        print(f"{key} changed ({etag} -> {new_etag}), reloading")
+        _pending_data[name] = build(json.loads(body.decode("utf-8")))
+        _data_etags[key] = new_etag
+
+
+def install_pending_data() -> None:
+    """Swap in data rebuilt by the background refresh"""
+    global _sessions_cache, _sessions_index, _speakers_cache
+
+    sessions = _pending_data.pop("sessions", None)
+    if sessions is not None:
+        _sessions_cache, _sessions_index = sessions
+        record_data_version("sessions", _sessions_cache)
+        clear_response_cache()
+
+    speakers = _pending_data.pop("speakers", None)
+    if speakers is not None:
+        _speakers_cache = speakers
+        record_data_version("speakers", _speakers_cache)
+        clear_response_cache()
+
+
+def run_refresh() -> None:
+    """Background refresh thread body"""
+    try:
+        refresh_data()
+    except Exception as e:
+        print(f"Error refreshing data: {e}")
+    finally:
+        _refresh_lock.release()
+
+
+def maybe_refresh_data() -> None:
+    """Install refreshed data, and start a freshness check every DATA_REFRESH_SECONDS
+
+    The check runs in a background thread so requests keep being served from
+    the current data; at most one check runs at a time.
+    """
+    global _last_refresh_check
+    install_pending_data()
+
+    if not DATA_REFRESH_SECONDS:
+        return
+    now = time.monotonic()
+    if now - _last_refresh_check < DATA_REFRESH_SECONDS:
+        return
+    if not _refresh_lock.acquire(blocking=False):
+        return
+
+    _last_refresh_check = now
+    threading.Thread(target=run_refresh, daemon=True).start()
+
+
+def preload_data() -> dict:
+    """Fetch sessions, speakers and llms.txt from S3 concurrently
+
+    Failures are reported per object and leave that cache empty, so it is
+    retried lazily by the first request that needs it. Returns the loaded
+    values by name.
+    """
+    loaders = {
+        "sessions": get_sessions,
+        "speakers": get_speakers,
+        "llms.txt": get_llms_txt,
+    }
+    loaded = {}
+    with ThreadPoolExecutor(max_workers=len(loaders)) as executor:
+        futures = {name: executor.submit(loader) for name, loader in loaders.items()}
+        for name, future in futures.items():
+            try:
+                loaded[name] = future.result()
+            except Exception as e:
+                print(f"Error preloading {name}: {e}")
+    return loaded
+
+
+def warm_up() -> None:
+    """Load the data and pre-render the unfiltered responses
+
+    Called at import time so that SnapStart snapshots already hold the data
+    caches and the most requested bodies.
+    """
+    loaded = preload_data()
+    encodings = ["gzip", "br"] if brotli is not None else ["gzip"]
+    media_types = ["application/json", *BINARY_ENCODERS]
+    for encoding in encodings:
+        for media_type in media_types:
+            if "sessions" in loaded:
+                sessions = loaded["sessions"]
+                cached_response("/sessions", {}, lambda: build_sessions_body(sessions, {}), encoding, media_type)
+            if "speakers" in loaded:
+                speakers = loaded["speakers"]
+                cached_response("/speakers", {}, lambda: build_speakers_body(speakers, {}), encoding, media_type)
+    if "speakers" in loaded:
+        get_speaker_index(loaded["speakers"])
+    if "sessions" in loaded and "speakers" in loaded:
+        get_join_index()
 
 
 def handler(event: dict, context: Any) -> dict:
@@ -273,97 +2632,204 @@ def handler(event: dict, context: Any) -> dict:
     if method == "OPTIONS":
         return create_response(200, "")
 
+    maybe_refresh_data()
+
     query_string = event.get("rawQueryString", "")
     params = parse_qs(query_string)
+    encoding = negotiate_encoding(get_header(event, "Accept-Encoding"))
+    media_type = negotiate_media_type(get_header(event, "Accept"))
+
+    try:
+        response = route_request(path, params, encoding, media_type)
+    except BadRequestError as e:
+        return create_response(400, {"error": "Bad Request", "message": str(e)})
+    return apply_validators(response, get_header(event, "If-None-Match"))
+
+
+def route_request(
+    path: str,
+    params: dict,
+    encoding: str | None,
+    media_type: str = "application/json",
+) -> dict:
+    """Dispatch a GET request to its endpoint
+
+    media_type applies to the JSON endpoints; application/msgpack and
+    application/cbor bodies are encoded from the JSON ones.
+    """
 
     if path in ["/", "/llms.txt"]:
-        return create_response(200, get_llms_txt(), "text/plain")
+        response = create_response(200, get_llms_txt(), "text/plain")
+        response["headers"]["Cache-Control"] = DATA_CACHE_CONTROL
+        return response
 
     elif path == "/robots.txt":
         robots_txt = "User-agent: *\nAllow: /\n"
-        return create_response(200, robots_txt, "text/plain")
+        response = create_response(200, robots_txt, "text/plain")
+        response["headers"]["Cache-Control"] = DATA_CACHE_CONTROL
+        return response
 
     elif path == "/health":
-        return create_response(200, {"status": "healthy", "service": "adoptai-api"})
+        response = create_response(200, {"status": "healthy", "service": "adoptai-api"})
+        response["headers"]["Cache-Control"] = NO_CACHE_CONTROL
+        return response
 
-    elif path == "/sessions":
+    elif path in ("/sessions", "/sessions.ics"):
         sessions = get_sessions()
 
         # Check if 'now' parameter is present
         now_param = params.get("now", [None])[0]
+        output = "ics" if path == "/sessions.ics" else parse_format(params, SESSION_FORMATS)
 
         if now_param and now_param.lower() in ["true", "1", "yes"]:
-            # Filter sessions happening now or starting soon
-            now_filtered = filter_sessions_by_now(sessions)
-
-            def format_session(session):
-                start = session.get("startTime", "")
-                end = session.get("endTime", "")
-                time_str = f"{start} - {end}".strip(" -") if start or end else ""
-                return {
-                    "id": session.get("id", ""),
-                    "title": session.get("title", ""),
-                    "date": session.get("date", ""),
-                    "time": time_str,
-                    "stage": session.get("stage", ""),
-                    "speakers": session.get("speakers", []),
-                    "ecosystems": session.get("ecosystems", []),
-                }
-
-            paris_now = get_paris_now()
-
-            return create_response(200, {
-                "currentTime": paris_now.strftime("%Y-%m-%d %H:%M:%S %Z"),
-                "ongoing": {
-                    "count": len(now_filtered["ongoing"]),
-                    "sessions": [format_session(s) for s in now_filtered["ongoing"]],
-                },
-                "upcoming": {
-                    "count": len(now_filtered["upcoming"]),
-                    "description": "Sessions starting within 30 minutes",
-                    "sessions": [format_session(s) for s in now_filtered["upcoming"]],
-                },
-            })
+            # Sessions happening now or starting soon
+            body_str = build_now_body(sessions)
+            if media_type in BINARY_ENCODERS:
+                response = create_raw_response(200, encode_binary_body(body_str, media_type), media_type)
+            else:
+                response = create_raw_response(200, body_str)
+            response["headers"]["Vary"] = "Accept"
+            response["headers"]["Cache-Control"] = NOW_CACHE_CONTROL
+            return response
+        elif output == "ics":
+            response = cached_response(
+                "/sessions.ics", {k: v for k, v in params.items() if k != "format"},
+                lambda: render_ics(select_sessions(sessions, params)[0], params),
+                encoding, ICS_CONTENT_TYPE,
+            )
+            response["headers"]["Cache-Control"] = DATA_CACHE_CONTROL
+            return response
+        elif output == "ndjson":
+            response = cached_response(
+                path, params,
+                lambda: render_ndjson(select_sessions(sessions, params)[0], params, SESSION_FIELDS),
+                encoding, NDJSON_CONTENT_TYPE,
+            )
+            response["headers"]["Cache-Control"] = DATA_CACHE_CONTROL
+            return response
+        elif output in COLUMNAR_CONTENT_TYPES:
+            response = cached_response(
+                path, params,
+                lambda: render_columnar(
+                    get_session_columns(sessions), select_sessions(sessions, params)[0],
+                    params, SESSION_FIELDS, output,
+                ),
+                encoding, COLUMNAR_CONTENT_TYPES[output],
+            )
+            response["headers"]["Cache-Control"] = DATA_CACHE_CONTROL
+            return response
         else:
-            # Regular filtering
-            filtered = filter_sessions(sessions, params)
-
-            formatted_sessions = []
-            for session in filtered:
-                start = session.get("startTime", "")
-                end = session.get("endTime", "")
-                time_str = f"{start} - {end}".strip(" -") if start or end else ""
-
-                formatted_session = {
-                    "id": session.get("id", ""),
-                    "title": session.get("title", ""),
-                    "date": session.get("date", ""),
-                    "time": time_str,
-                    "stage": session.get("stage", ""),
-                    "speakers": session.get("speakers", []),
-                    "ecosystems": session.get("ecosystems", []),
-                }
-                formatted_sessions.append(formatted_session)
-
-            return create_response(200, {
-                "total": len(sessions),
-                "count": len(formatted_sessions),
-                "filters": {k: v[0] for k, v in params.items() if v},
-                "sessions": formatted_sessions,
+            # Regular filtering, served from the response cache when possible
+            response = cached_response(
+                path, params, lambda: build_sessions_body(sessions, params), encoding, media_type
+            )
+            response["headers"]["Cache-Control"] = DATA_CACHE_CONTROL
+            return response
+
+    elif path == "/facets":
+        sessions = get_sessions()
+        response = cached_response(path, params, lambda: build_facets_body(sessions, params), encoding, media_type)
+        response["headers"]["Cache-Control"] = DATA_CACHE_CONTROL
+        return response
+
+    elif path == "/itinerary":
+        sessions = get_sessions()
+        response = cached_response(path, params, lambda: build_itinerary_body(sessions, params), encoding, media_type)
+        response["headers"]["Cache-Control"] = DATA_CACHE_CONTROL
+        return response
+
+    elif path == "/changes":
+        sessions = get_sessions()
+        speakers = get_speakers()
+        since = parse_since(params)
+        if since is not None and not known_version(since):
+            response = create_response(410, {
+                "error": "Gone",
+                "message": f"Version {'.'.join(since)} is no longer available, reload /sessions and /speakers",
+                "version": get_data_version(),
             })
+            response["headers"]["Cache-Control"] = NO_CACHE_CONTROL
+            return response
+        response = cached_response(
+            path, params, lambda: build_changes_body(sessions, speakers, since), encoding, media_type
+        )
+        response["headers"]["Cache-Control"] = DATA_CACHE_CONTROL
+        return response
+
+    elif path == "/batch":
+        response = cached_response(path, params, lambda: build_batch_body(params), encoding, media_type)
+        response["headers"]["Cache-Control"] = DATA_CACHE_CONTROL
+        return response
 
     elif path == "/speakers":
         speakers = get_speakers()
-        filtered = filter_speakers(speakers, params)
-
-        return create_response(200, {
-            "count": len(filtered),
-            "speakers": filtered,
-        })
+        output = parse_format(params, SPEAKER_FORMATS)
+        if output == "ndjson":
+            response = cached_response(
+                path, params,
+                lambda: render_ndjson(filter_speakers(speakers, params), params, SPEAKER_FIELDS),
+                encoding, NDJSON_CONTENT_TYPE,
+            )
+        elif output in COLUMNAR_CONTENT_TYPES:
+            response = cached_response(
+                path, params,
+                lambda: render_columnar(
+                    get_speaker_columns(speakers), filter_speakers(speakers, params),
+                    params, SPEAKER_FIELDS, output,
+                ),
+                encoding, COLUMNAR_CONTENT_TYPES[output],
+            )
+        else:
+            response = cached_response(
+                path, params, lambda: build_speakers_body(speakers, params), encoding, media_type
+            )
+        response["headers"]["Cache-Control"] = DATA_CACHE_CONTROL
+        return response
+
+    elif path.startswith("/sessions/") and path.count("/") == 2:
+        session_id = unquote(path[len("/sessions/"):])
+        pos = get_session_index(get_sessions()).positions.get(session_id)
+        if pos is None:
+            return not_found_response(f"Session {session_id} not found")
+        join = get_join_index()
+        response = prerendered_response(
+            ("/sessions/", session_id), join.session_bodies[pos], join.session_etags[pos], encoding, media_type
+        )
+        response["headers"]["Cache-Control"] = DATA_CACHE_CONTROL
+        return response
+
+    elif path.startswith("/speakers/") and path.count("/") in (2, 3):
+        join = get_join_index()
+        name, _, sub = path[len("/speakers/"):].partition("/")
+        if sub not in ("", "sessions"):
+            return not_found_response(f"Path {path} not found")
+        name = unquote(name)
+        pos = join.speaker_names.get(name)
+        if pos is None:
+            pos = join.speaker_positions.get(slugify(name))
+        if pos is None:
+            return not_found_response(f"Speaker {name} not found")
+        build_body = build_speaker_sessions_body if sub else build_speaker_detail_body
+        canonical = f"/speakers/{join.speaker_slugs[pos]}/{sub}".rstrip("/")
+        response = cached_response(canonical, {}, lambda: build_body(join, pos), encoding, media_type)
+        response["headers"]["Cache-Control"] = DATA_CACHE_CONTROL
+        return response
 
     else:
         return create_response(404, {
             "error": "Not Found",
             "message": f"Path {path} not found",
-            "available_endpoints": ["/", "/llms.txt", "/robots.txt", "/sessions", "/speakers", "/health"],
+            "available_endpoints": [
+                "/", "/llms.txt", "/robots.txt", "/sessions", "/sessions.ics", "/sessions/{id}", "/facets", "/itinerary", "/batch",
+                "/changes", "/speakers", "/speakers/{slug}", "/speakers/{slug}/sessions", "/health",
+            ],
         })
+
+
+# Runs during the init phase: with SnapStart the loaded data and pre-rendered
+# bodies are part of the snapshot. Set DATA_LOADING=lazy for local runs.
+if BUCKET_NAME and DATA_LOADING != "lazy":
+    try:
+        warm_up()
+    except Exception as e:
+        print(f"Error during warm-up: {e}")
@@ -155,7 +155,7 @@ def s3_mock(sample_sessions_data, sample_speakers_data, sample_llms_txt):
 @pytest.fixture
 def api_event():
     """Sample Lambda event for API Gateway"""
-    def _make_event(method="GET", path="/", query_string=""):
+    def _make_event(method="GET", path="/", query_string="", headers=None):
         return {
             "requestContext": {
                 "http": {
@@ -163,7 +163,8 @@ def api_event():
                     "path": path
                 }
             },
-            "rawQueryString": query_string
+            "rawQueryString": query_string,
+            "headers": headers or {}
         }
     return _make_event
 
@@ -175,7 +176,29 @@ def reset_cache():
     handler._sessions_cache = None
     handler._speakers_cache = None
     handler._llms_txt_cache = None
+    handler._sessions_index = None
+    handler._join_index = None
+    handler._speakers_index = None
+    handler._session_columns = None
+    handler._speaker_columns = None
+    handler.clear_response_cache()
+    handler._now_cache = None
+    handler._data_etags.clear()
+    handler._pending_data.clear()
+    handler._data_versions.clear()
+    handler._data_history.clear()
     yield
     handler._sessions_cache = None
     handler._speakers_cache = None
     handler._llms_txt_cache = None
+    handler._sessions_index = None
+    handler._join_index = None
+    handler._speakers_index = None
+    handler._session_columns = None
+    handler._speaker_columns = None
+    handler.clear_response_cache()
+    handler._now_cache = None
+    handler._data_etags.clear()
+    handler._pending_data.clear()
+    handler._data_versions.clear()
+    handler._data_history.clear()
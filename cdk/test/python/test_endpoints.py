@@ -1,7 +1,10 @@
 """Tests for API endpoints"""
 
+import base64
+import gzip
 import json
 import pytest
+from unittest.mock import patch
 import handler
 
 
@@ -164,3 +167,579 @@ def test_no_internal_fields_exposed(s3_mock, api_event):
     for session in data["sessions"]:
         assert "_start_dt" not in session
         assert "_end_dt" not in session
+
+
+def test_sessions_response_is_cached(s3_mock, api_event):
+    """Test that repeated queries are served from the response cache"""
+    event = api_event(method="GET", path="/sessions", query_string="stage=CEO Stage&time=morning")
+    reordered = api_event(method="GET", path="/sessions", query_string="time=morning&stage=CEO Stage")
+
+    first = handler.handler(event, None)
+
+    with patch("handler.build_sessions_body") as build_body:
+        second = handler.handler(reordered, None)
+
+    build_body.assert_not_called()
+    assert second["body"] == first["body"]
+
+
+def test_response_cache_cleared_on_reload(s3_mock, api_event):
+    """Test that cached bodies are dropped when the data caches reload"""
+    event = api_event(method="GET", path="/speakers")
+    handler.handler(event, None)
+    assert handler._response_cache
+
+    handler._speakers_cache = None
+    handler.get_speakers()
+
+    assert not handler._response_cache
+
+
+def test_warm_up_prerenders_unfiltered_responses(s3_mock):
+    """Test that warm_up caches the unfiltered /sessions and /speakers bodies"""
+    handler.warm_up()
+
+    assert handler.response_cache_key("/sessions", {}) in handler._response_cache
+    assert handler.response_cache_key("/speakers", {}) in handler._response_cache
+
+
+def test_sessions_gzip_when_accepted(s3_mock, api_event, monkeypatch):
+    """Test that /sessions is gzip-compressed when the client accepts it"""
+    monkeypatch.setattr(handler, "MIN_COMPRESS_BYTES", 0)
+    event = api_event(method="GET", path="/sessions", headers={"accept-encoding": "gzip, deflate"})
+
+    response = handler.handler(event, None)
+
+    assert response["headers"]["Content-Encoding"] == "gzip"
+    assert response["isBase64Encoded"] is True
+    data = json.loads(gzip.decompress(base64.b64decode(response["body"])))
+    assert data["count"] == 3
+
+
+def test_sessions_brotli_when_accepted(s3_mock, api_event, monkeypatch):
+    """Test that /sessions is brotli-compressed with the bundled brotli module"""
+    brotli = pytest.importorskip("brotli")
+    monkeypatch.setattr(handler, "MIN_COMPRESS_BYTES", 0)
+    event = api_event(method="GET", path="/sessions", headers={"accept-encoding": "gzip, br"})
+
+    response = handler.handler(event, None)
+
+    assert response["headers"]["Content-Encoding"] == "br"
+    data = json.loads(brotli.decompress(base64.b64decode(response["body"])))
+    assert data["count"] == 3
+
+
+def test_sessions_uncompressed_without_accept_encoding(s3_mock, api_event, monkeypatch):
+    """Test that bodies stay plain JSON without Accept-Encoding"""
+    monkeypatch.setattr(handler, "MIN_COMPRESS_BYTES", 0)
+    event = api_event(method="GET", path="/sessions")
+
+    response = handler.handler(event, None)
+
+    assert "Content-Encoding" not in response["headers"]
+    assert "isBase64Encoded" not in response
+    assert json.loads(response["body"])["count"] == 3
+
+
+def test_small_bodies_not_compressed(s3_mock, api_event):
+    """Test that bodies under MIN_COMPRESS_BYTES are sent as is"""
+    event = api_event(method="GET", path="/speakers", query_string="search=John",
+                      headers={"Accept-Encoding": "gzip"})
+
+    response = handler.handler(event, None)
+
+    assert "Content-Encoding" not in response["headers"]
+    assert json.loads(response["body"])["count"] == 1
+
+
+def test_sessions_has_etag_and_cache_control(s3_mock, api_event):
+    """Test that data responses carry an ETag and a long Cache-Control"""
+    event = api_event(method="GET", path="/sessions")
+
+    response = handler.handler(event, None)
+
+    assert response["headers"]["ETag"].startswith('W/"')
+    assert response["headers"]["Cache-Control"] == handler.DATA_CACHE_CONTROL
+
+
+def test_if_none_match_returns_304(s3_mock, api_event):
+    """Test that a matching If-None-Match gets an empty 304"""
+    first = handler.handler(api_event(method="GET", path="/speakers"), None)
+    etag = first["headers"]["ETag"]
+
+    event = api_event(method="GET", path="/speakers", headers={"if-none-match": etag})
+    response = handler.handler(event, None)
+
+    assert response["statusCode"] == 304
+    assert response["body"] == ""
+    assert response["headers"]["ETag"] == etag
+    assert response["headers"]["Cache-Control"] == handler.DATA_CACHE_CONTROL
+
+
+def test_stale_if_none_match_returns_body(s3_mock, api_event):
+    """Test that a non-matching If-None-Match gets the full response"""
+    event = api_event(method="GET", path="/speakers", headers={"If-None-Match": 'W/"stale"'})
+
+    response = handler.handler(event, None)
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["count"] == 2
+
+
+def test_etag_shared_by_compressed_variant(s3_mock, api_event, monkeypatch):
+    """Test that gzip and plain variants share the same weak ETag"""
+    monkeypatch.setattr(handler, "MIN_COMPRESS_BYTES", 0)
+    plain = handler.handler(api_event(method="GET", path="/sessions"), None)
+    gzipped = handler.handler(
+        api_event(method="GET", path="/sessions", headers={"accept-encoding": "gzip"}), None
+    )
+
+    assert gzipped["headers"]["Content-Encoding"] == "gzip"
+    assert gzipped["headers"]["ETag"] == plain["headers"]["ETag"]
+
+
+def test_now_has_short_cache_control(s3_mock, api_event):
+    """Test that now=true responses are cacheable only briefly"""
+    event = api_event(method="GET", path="/sessions", query_string="now=true")
+
+    response = handler.handler(event, None)
+
+    assert response["headers"]["Cache-Control"] == handler.NOW_CACHE_CONTROL
+    assert "ETag" in response["headers"]
+
+
+def test_health_is_not_cached(s3_mock, api_event):
+    """Test that /health is never cached"""
+    response = handler.handler(api_event(method="GET", path="/health"), None)
+
+    assert response["headers"]["Cache-Control"] == "no-store"
+
+
+def test_session_by_id_with_speakers(s3_mock, api_event):
+    """Test GET /sessions/{id} returns the session joined with its speakers"""
+    event = api_event(method="GET", path="/sessions/session-3")
+    response = handler.handler(event, None)
+    data = json.loads(response["body"])
+
+    assert response["statusCode"] == 200
+    assert data["session"]["id"] == "session-3"
+    assert data["session"]["time"] == "10:00 AM - 10:30 AM"
+    assert [sp["name"] for sp in data["speakers"]] == ["Jane Smith"]
+    assert data["speakers"][0]["sessions"] == ["session-3"]
+    assert "ETag" in response["headers"]
+
+
+def test_session_by_id_not_found(s3_mock, api_event):
+    """Test GET /sessions/{id} returns 404 for an unknown id"""
+    event = api_event(method="GET", path="/sessions/unknown")
+    response = handler.handler(event, None)
+
+    assert response["statusCode"] == 404
+    assert "unknown" in json.loads(response["body"])["message"]
+
+
+def test_speaker_by_slug_with_sessions(s3_mock, api_event):
+    """Test GET /speakers/{slug} returns the speaker and full session records"""
+    event = api_event(method="GET", path="/speakers/john-doe")
+    response = handler.handler(event, None)
+    data = json.loads(response["body"])
+
+    assert response["statusCode"] == 200
+    assert data["speaker"]["name"] == "John Doe"
+    assert [s["title"] for s in data["sessions"]] == ["AI in Banking"]
+
+
+def test_speaker_sessions_by_name(s3_mock, api_event):
+    """Test GET /speakers/{name}/sessions accepts the URL-encoded name"""
+    event = api_event(method="GET", path="/speakers/Jane%20Smith/sessions")
+    response = handler.handler(event, None)
+    data = json.loads(response["body"])
+
+    assert response["statusCode"] == 200
+    assert data["speaker"] == "Jane Smith"
+    assert data["count"] == 1
+    assert data["sessions"][0]["id"] == "session-3"
+
+
+def test_speaker_name_wins_over_colliding_slug(s3_mock, api_event):
+    """Test that the exact name finds its speaker when another one has its slug"""
+    handler.get_sessions()
+    handler._speakers_cache = handler.speakers_from_json({"speakers": [
+        {"name": "FLORENCE BENEZIT", "sessions": ["session-1"]},
+        {"name": "Florence Bénézit", "sessions": ["session-3"]},
+    ]})
+
+    by_name = handler.handler(api_event(method="GET", path="/speakers/Florence%20B%C3%A9n%C3%A9zit"), None)
+    by_slug = handler.handler(api_event(method="GET", path="/speakers/florence-benezit-2"), None)
+    other = handler.handler(api_event(method="GET", path="/speakers/FLORENCE%20BENEZIT"), None)
+
+    assert json.loads(by_name["body"])["speaker"]["name"] == "Florence Bénézit"
+    assert by_name["body"] == by_slug["body"]
+    assert json.loads(other["body"])["speaker"]["name"] == "FLORENCE BENEZIT"
+
+
+def test_speaker_by_non_ascii_slug(s3_mock, api_event):
+    """Test that a slug keeping letters without an ASCII form finds its speaker"""
+    handler.get_sessions()
+    handler._speakers_cache = handler.speakers_from_json({"speakers": [
+        {"name": "Łukasz Ørsted", "sessions": ["session-1"]},
+    ]})
+
+    response = handler.handler(api_event(method="GET", path="/speakers/%C5%82ukasz-%C3%B8rsted"), None)
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["speaker"]["name"] == "Łukasz Ørsted"
+
+
+@pytest.mark.parametrize("path", ["/speakers/nobody", "/speakers/john-doe/talks"])
+def test_speaker_routes_not_found(s3_mock, api_event, path):
+    """Test unknown speakers and sub-resources return 404"""
+    event = api_event(method="GET", path=path)
+
+    assert handler.handler(event, None)["statusCode"] == 404
+
+
+def test_session_by_id_is_prerendered(s3_mock, api_event):
+    """Test that /sessions/{id} is served from the prerendered body without filtering"""
+    handler.handler(api_event(method="GET", path="/sessions/session-1"), None)
+
+    with patch("handler.filter_sessions") as filter_sessions, patch("handler.compute_etag") as compute_etag:
+        response = handler.handler(api_event(method="GET", path="/sessions/session-1"), None)
+
+    filter_sessions.assert_not_called()
+    compute_etag.assert_not_called()
+    join = handler.get_join_index()
+    assert response["body"] == join.session_bodies[0]
+    assert response["headers"]["ETag"] == join.session_etags[0]
+
+
+def test_session_by_id_if_none_match_returns_304(s3_mock, api_event):
+    """Test that each session has its own ETag"""
+    first = handler.handler(api_event(method="GET", path="/sessions/session-1"), None)
+    other = handler.handler(api_event(method="GET", path="/sessions/session-2"), None)
+    etag = first["headers"]["ETag"]
+
+    revalidated = handler.handler(
+        api_event(method="GET", path="/sessions/session-1", headers={"If-None-Match": etag}), None
+    )
+
+    assert other["headers"]["ETag"] != etag
+    assert revalidated["statusCode"] == 304
+
+
+def test_facets_endpoint(s3_mock, api_event):
+    """Test GET /facets returns value counts of the default facets"""
+    event = api_event(method="GET", path="/facets")
+    response = handler.handler(event, None)
+    data = json.loads(response["body"])
+
+    assert response["statusCode"] == 200
+    assert data["count"] == 3
+    assert list(data["facets"]) == ["stage", "ecosystem", "date"]
+    assert data["facets"]["stage"] == {"CEO Stage": 2, "Mainstage South": 1}
+    assert data["facets"]["date"] == {"Nov 25, 2025": 2, "Nov 26, 2025": 1}
+
+
+def test_facets_follow_filters(s3_mock, api_event):
+    """Test that facet counts are computed over the filtered sessions"""
+    event = api_event(method="GET", path="/facets", query_string="date=2025-11-25&facets=company,stage")
+    data = json.loads(handler.handler(event, None)["body"])
+
+    assert data["count"] == 2
+    assert data["facets"] == {
+        "company": {"BigBank": 1},
+        "stage": {"CEO Stage": 1, "Mainstage South": 1},
+    }
+
+
+def test_unknown_facet_is_bad_request(s3_mock, api_event):
+    """Test that an unknown facet returns 400"""
+    event = api_event(method="GET", path="/facets", query_string="facets=room")
+
+    assert handler.handler(event, None)["statusCode"] == 400
+
+
+def test_batch_answers_every_query(s3_mock, api_event):
+    """Test GET /batch returns one keyed result per sub-query"""
+    event = api_event(
+        method="GET", path="/batch",
+        query_string="q=stage%3DCEO%20Stage&q=date%3D2025-11-25%26time%3Dafternoon"
+                     "&q=%2Fspeakers%3Fsearch%3DAnthropic",
+    )
+    response = handler.handler(event, None)
+    data = json.loads(response["body"])
+
+    assert response["statusCode"] == 200
+    assert list(data["results"]) == [
+        "stage=CEO Stage", "date=2025-11-25&time=afternoon", "/speakers?search=Anthropic",
+    ]
+    assert data["results"]["stage=CEO Stage"]["sessions"] == ["session-1", "session-3"]
+    assert data["results"]["date=2025-11-25&time=afternoon"]["sessions"] == ["session-2"]
+    assert data["results"]["/speakers?search=Anthropic"]["speakers"] == ["Jane Smith"]
+    assert data["speakers"]["Jane Smith"]["company"] == "Anthropic"
+
+
+def test_batch_shares_records(s3_mock, api_event):
+    """Test that records matched by several sub-queries are returned once"""
+    event = api_event(method="GET", path="/batch", query_string="q=search%3Dai&q=stage%3DCEO%20Stage&q=limit%3D1")
+    data = json.loads(handler.handler(event, None)["body"])
+
+    assert list(data["sessions"]) == ["session-1", "session-3"]
+    assert data["sessions"]["session-3"]["title"] == "Future of AI"
+    assert data["results"]["limit=1"]["matched"] == 3
+    assert data["results"]["limit=1"]["nextCursor"] == "1"
+
+
+@pytest.mark.parametrize("query", [
+    "", "q=now%3Dtrue", "q=fields%3Did", "q=%2Fhealth", "q=x" + "&q=x".join(str(i) for i in range(21)),
+    "q=limit%3D%25C2%25B2",
+])
+def test_batch_invalid_queries_are_bad_request(s3_mock, api_event, query):
+    """Test that missing, unsupported or too many sub-queries return 400"""
+    event = api_event(method="GET", path="/batch", query_string=query)
+
+    assert handler.handler(event, None)["statusCode"] == 400
+
+
+def test_itinerary_from_ids_and_interests(s3_mock, api_event):
+    """Test GET /itinerary returns requested and matching sessions in time order"""
+    event = api_event(method="GET", path="/itinerary", query_string="ids=session-3&interests=cloud")
+    response = handler.handler(event, None)
+    data = json.loads(response["body"])
+
+    assert response["statusCode"] == 200
+    assert [s["id"] for s in data["sessions"]] == ["session-2", "session-3"]
+    assert data["bufferMinutes"] == 5
+    assert data["conflicts"] == []
+
+
+@pytest.mark.parametrize("query", [
+    "", "ids=unknown", "ids=session-1&buffer=90", "interests=ai&buffer=x", "interests=ai&buffer=%C2%B2",
+])
+def test_itinerary_invalid_parameters(s3_mock, api_event, query):
+    """Test that missing or invalid itinerary parameters return 400"""
+    event = api_event(method="GET", path="/itinerary", query_string=query)
+
+    assert handler.handler(event, None)["statusCode"] == 400
+
+
+def test_sessions_ics_export(s3_mock, api_event):
+    """Test GET /sessions.ics returns a calendar with one VEVENT per session"""
+    event = api_event(method="GET", path="/sessions.ics")
+    response = handler.handler(event, None)
+    body = response["body"]
+
+    assert response["statusCode"] == 200
+    assert response["headers"]["Content-Type"].startswith("text/calendar")
+    assert body.startswith("BEGIN:VCALENDAR\r\n")
+    assert body.endswith("END:VCALENDAR\r\n")
+    assert body.count("BEGIN:VEVENT") == 3
+    # 9:30 Paris time is 8:30 UTC in November
+    assert "DTSTART:20251125T083000Z\r\n" in body
+    assert "SUMMARY:AI in Banking\r\n" in body
+    assert "ETag" in response["headers"]
+
+
+def test_sessions_format_ics_is_filtered(s3_mock, api_event):
+    """Test that format=ics exports the filtered sessions only"""
+    event = api_event(method="GET", path="/sessions", query_string="format=ics&stage=CEO Stage")
+    body = handler.handler(event, None)["body"]
+
+    assert body.count("BEGIN:VEVENT") == 2
+    assert "UID:session-2@" not in body
+
+
+def test_sessions_ics_if_none_match_returns_304(s3_mock, api_event):
+    """Test that calendar polling gets a 304 while the data is unchanged"""
+    etag = handler.handler(api_event(method="GET", path="/sessions.ics"), None)["headers"]["ETag"]
+    event = api_event(method="GET", path="/sessions.ics", headers={"If-None-Match": etag})
+
+    assert handler.handler(event, None)["statusCode"] == 304
+
+
+def test_speakers_reject_ics(s3_mock, api_event):
+    """Test that formats are validated per endpoint"""
+    event = api_event(method="GET", path="/speakers", query_string="format=ics")
+
+    assert handler.handler(event, None)["statusCode"] == 400
+
+
+def test_sessions_msgpack_when_accepted(s3_mock, api_event):
+    """Test that Accept: application/msgpack gets the JSON body as MessagePack"""
+    plain = handler.handler(api_event(method="GET", path="/sessions"), None)
+    event = api_event(method="GET", path="/sessions", headers={"Accept": "application/msgpack"})
+
+    response = handler.handler(event, None)
+
+    assert response["headers"]["Content-Type"] == "application/msgpack"
+    assert response["headers"]["Vary"] == "Accept-Encoding, Accept"
+    assert response["isBase64Encoded"] is True
+    expected = handler.msgpack_encode(json.loads(plain["body"]))
+    assert base64.b64decode(response["body"]) == expected
+    assert response["headers"]["ETag"] != plain["headers"]["ETag"]
+
+
+def test_session_detail_cbor_gzip(s3_mock, api_event, monkeypatch):
+    """Test that binary variants are compressed like JSON bodies"""
+    monkeypatch.setattr(handler, "MIN_COMPRESS_BYTES", 0)
+    plain = handler.handler(api_event(method="GET", path="/sessions/session-1"), None)
+    event = api_event(method="GET", path="/sessions/session-1",
+                      headers={"Accept": "application/cbor", "Accept-Encoding": "gzip"})
+
+    response = handler.handler(event, None)
+
+    assert response["headers"]["Content-Type"] == "application/cbor"
+    assert response["headers"]["Content-Encoding"] == "gzip"
+    expected = handler.cbor_encode(json.loads(plain["body"]))
+    assert gzip.decompress(base64.b64decode(response["body"])) == expected
+
+
+def test_binary_variant_is_cached(s3_mock, api_event):
+    """Test that the encoded variant is cached next to the JSON body"""
+    event = api_event(method="GET", path="/speakers", headers={"Accept": "application/cbor"})
+    handler.handler(event, None)
+
+    key = handler.response_cache_key("/speakers", {})
+    assert key in handler._response_cache
+    assert key + ("application/cbor",) in handler._response_cache
+
+
+def test_binary_variant_if_none_match_returns_304(s3_mock, api_event):
+    """Test that binary variants revalidate against their own ETag"""
+    headers = {"Accept": "application/msgpack"}
+    etag = handler.handler(api_event(method="GET", path="/speakers", headers=headers), None)["headers"]["ETag"]
+    event = api_event(method="GET", path="/speakers", headers={**headers, "If-None-Match": etag})
+
+    assert handler.handler(event, None)["statusCode"] == 304
+
+
+def test_now_varies_on_accept(s3_mock, api_event):
+    """Test that ?now=true, whose body follows Accept, tells caches so"""
+    plain = handler.handler(api_event(method="GET", path="/sessions", query_string="now=true"), None)
+    event = api_event(method="GET", path="/sessions", query_string="now=true",
+                      headers={"Accept": "application/cbor"})
+
+    response = handler.handler(event, None)
+
+    assert response["headers"]["Content-Type"] == "application/cbor"
+    assert response["headers"]["Vary"] == "Accept"
+    assert plain["headers"]["Vary"] == "Accept"
+
+
+def test_errors_stay_json_with_binary_accept(s3_mock, api_event):
+    """Test that error bodies are JSON whatever the Accept header"""
+    event = api_event(method="GET", path="/sessions", query_string="limit=abc",
+                      headers={"Accept": "application/msgpack"})
+
+    response = handler.handler(event, None)
+
+    assert response["statusCode"] == 400
+    assert "application/json" in response["headers"]["Content-Type"]
+
+
+def test_sessions_format_csv(s3_mock, api_event):
+    """Test that format=csv returns one row per session with flattened speakers"""
+    event = api_event(method="GET", path="/sessions", query_string="format=csv")
+
+    response = handler.handler(event, None)
+
+    assert response["statusCode"] == 200
+    assert response["headers"]["Content-Type"] == "text/csv; charset=utf-8"
+    lines = response["body"].split("\r\n")
+    assert lines[0] == "id,title,date,time,stage,speaker_names,speaker_companies,speaker_titles,ecosystems"
+    assert lines[1] == 'session-1,AI in Banking,"Nov 25, 2025",9:30 AM - 10:00 AM,CEO Stage,John Doe,BigBank,,finance'
+    assert len(lines) == 5 and lines[-1] == ""
+
+
+def test_sessions_format_csv_filtered_and_projected(s3_mock, api_event):
+    """Test that csv exports follow the filters and ?fields="""
+    event = api_event(method="GET", path="/sessions",
+                      query_string="format=csv&stage=CEO Stage&fields=id,speakers")
+
+    body = handler.handler(event, None)["body"]
+
+    assert body == (
+        "id,speaker_names,speaker_companies,speaker_titles\r\n"
+        "session-1,John Doe,BigBank,\r\n"
+        "session-3,Jane Smith,Anthropic,\r\n"
+    )
+
+
+def test_speakers_format_csv(s3_mock, api_event):
+    """Test that speakers export their session ids and count"""
+    event = api_event(method="GET", path="/speakers", query_string="format=csv&search=Jane")
+
+    body = handler.handler(event, None)["body"]
+
+    assert body == (
+        "name,initials,company,title,session_ids,session_count\r\n"
+        "Jane Smith,,Anthropic,Researcher,session-3,1\r\n"
+    )
+
+
+def test_format_arrow_without_pyarrow(s3_mock, api_event, monkeypatch):
+    """Test that format=arrow is refused when pyarrow is not bundled"""
+    monkeypatch.setattr(handler, "pyarrow", None)
+    event = api_event(method="GET", path="/sessions", query_string="format=arrow")
+
+    response = handler.handler(event, None)
+
+    assert response["statusCode"] == 400
+    assert "arrow" in json.loads(response["body"])["message"]
+
+
+def test_sessions_format_arrow(s3_mock, api_event):
+    """Test that format=arrow returns an Arrow IPC stream of the same columns"""
+    pyarrow = pytest.importorskip("pyarrow")
+    import pyarrow.ipc
+    event = api_event(method="GET", path="/sessions", query_string="format=arrow&date=2025-11-26")
+
+    response = handler.handler(event, None)
+
+    assert response["headers"]["Content-Type"] == "application/vnd.apache.arrow.stream"
+    assert response["isBase64Encoded"] is True
+    table = pyarrow.ipc.open_stream(base64.b64decode(response["body"])).read_all()
+    assert table.column_names[:2] == ["id", "title"]
+    assert table.column("speaker_names").to_pylist() == ["Jane Smith"]
+
+
+def test_changes_without_since_lists_everything(s3_mock, api_event):
+    """Test that /changes without since reports every record as added"""
+    response = handler.handler(api_event(method="GET", path="/changes"), None)
+
+    assert response["statusCode"] == 200
+    data = json.loads(response["body"])
+    assert data["since"] is None
+    assert data["version"] == handler.get_data_version()
+    assert data["count"] == 5
+    assert [s["id"] for s in data["sessions"]["added"]] == ["session-1", "session-2", "session-3"]
+    assert [sp["name"] for sp in data["speakers"]["added"]] == ["John Doe", "Jane Smith"]
+
+
+def test_changes_since_current_version_is_empty(s3_mock, api_event):
+    """Test that an up-to-date mirror gets no changes"""
+    version = handler.get_data_version()
+    event = api_event(method="GET", path="/changes", query_string=f"since={version}")
+
+    data = json.loads(handler.handler(event, None)["body"])
+
+    assert data["count"] == 0
+    assert data["sessions"] == {"added": [], "modified": [], "removed": []}
+
+
+def test_changes_since_unknown_version_is_gone(s3_mock, api_event):
+    """Test that versions outside the history get a 410 with the current version"""
+    event = api_event(method="GET", path="/changes", query_string="since=0123456789abcdef.0123456789abcdef")
+
+    response = handler.handler(event, None)
+
+    assert response["statusCode"] == 410
+    assert json.loads(response["body"])["version"] == handler.get_data_version()
+
+
+def test_changes_invalid_since(s3_mock, api_event):
+    """Test that a since without both versions is a 400"""
+    event = api_event(method="GET", path="/changes", query_string="since=abc")
+
+    assert handler.handler(event, None)["statusCode"] == 400
+
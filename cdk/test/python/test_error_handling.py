@@ -1,6 +1,7 @@
 """Tests for error handling"""
 
 import json
+from dataclasses import fields
 import pytest
 from unittest.mock import patch
 from botocore.exceptions import ClientError
@@ -71,17 +72,34 @@ def test_get_sessions_caching(s3_mock):
 
 
 def test_get_sessions_adds_parsed_datetimes(s3_mock):
-    """Test that get_sessions adds _start_dt and _end_dt to sessions"""
+    """Test that get_sessions records carry parsed start_dt and end_dt"""
     sessions = handler.get_sessions()
 
     for session in sessions:
-        assert "_start_dt" in session
-        assert "_end_dt" in session
+        assert isinstance(session, handler.Session)
 
         # Should be datetime objects or None
-        if session["_start_dt"] is not None:
+        if session.start_dt is not None:
             from datetime import datetime
-            assert isinstance(session["_start_dt"], datetime)
+            assert isinstance(session.start_dt, datetime)
+
+
+def test_get_sessions_precomputes_public_projection(s3_mock):
+    """Test that the formatted time and public fields are built at load"""
+    sessions = handler.get_sessions()
+
+    assert sessions[0].public["time"] == "9:30 AM - 10:00 AM"
+    assert sessions[0].public["id"] == "session-1"
+    assert not hasattr(sessions[0], "__dict__")
+
+
+def test_get_speakers_returns_records(s3_mock):
+    """Test that get_speakers returns slotted records around the raw entries"""
+    speakers = handler.get_speakers()
+
+    assert isinstance(speakers[0], handler.Speaker)
+    assert speakers[0].public["name"] == "John Doe"
+    assert speakers[0].search_fields == ("john doe", "bigbank", "ceo")
 
 
 def test_get_speakers_caching(s3_mock):
@@ -201,3 +219,256 @@ def test_create_response_preserves_utf8_in_json(s3_mock):
     body = json.loads(response["body"])
     assert body["message"] == "Hello • World"
     assert "•" in response["body"]
+
+
+def put_snapshots(sample_sessions_data, sample_speakers_data):
+    """Compile the sample data and upload the snapshots to the mocked bucket"""
+    import boto3
+    s3_client = boto3.client("s3", region_name="us-east-1")
+    for name, data, compile_snapshot in (
+        ("sessions", sample_sessions_data, handler.compile_sessions_snapshot),
+        ("speakers", sample_speakers_data, handler.compile_speakers_snapshot),
+    ):
+        snapshot = compile_snapshot(json.dumps(data).encode("utf-8"))
+        s3_client.put_object(
+            Bucket="test-adoptai-bucket",
+            Key=f"data/{name}.snapshot.json",
+            Body=json.dumps(snapshot).encode("utf-8"),
+        )
+
+
+def test_get_sessions_loads_snapshot(s3_mock, sample_sessions_data, sample_speakers_data):
+    """Test that a deployed snapshot is used instead of rebuilding the index"""
+    put_snapshots(sample_sessions_data, sample_speakers_data)
+
+    with patch("handler.build_session_index") as build_index, \
+         patch("handler.parse_session_datetime") as parse_datetime:
+        sessions = handler.get_sessions()
+
+    build_index.assert_not_called()
+    parse_datetime.assert_not_called()
+    assert [s.id for s in sessions] == ["session-1", "session-2", "session-3"]
+    assert sessions[0].start_dt == handler.parse_session_datetime("Nov 25, 2025", "9:30 AM")
+    assert handler._sessions_index.sessions is sessions
+    assert handler.filter_sessions(sessions, {"search": ["anthropic"]}) == [sessions[2]]
+
+
+def test_get_speakers_loads_snapshot(s3_mock, sample_sessions_data, sample_speakers_data):
+    """Test that speakers are rebuilt from their snapshot"""
+    put_snapshots(sample_sessions_data, sample_speakers_data)
+
+    speakers = handler.get_speakers()
+
+    assert speakers[1].public == sample_speakers_data["speakers"][1]
+    assert speakers[1].search_fields == ("jane smith", "anthropic", "researcher")
+
+
+def test_snapshot_with_other_format_is_ignored(s3_mock, monkeypatch, sample_sessions_data, sample_speakers_data):
+    """Test fallback to the raw JSON when the snapshot format is outdated"""
+    put_snapshots(sample_sessions_data, sample_speakers_data)
+    monkeypatch.setattr(handler, "SNAPSHOT_FORMAT", handler.SNAPSHOT_FORMAT + 1)
+
+    sessions = handler.get_sessions()
+
+    assert len(sessions) == 3
+    assert handler._sessions_index.sessions is sessions
+
+
+def test_snapshot_index_matches_built_index(sample_sessions_data):
+    """Test that the index rebuilt from a snapshot equals a freshly built one"""
+    snapshot = handler.compile_sessions_snapshot(json.dumps(sample_sessions_data).encode("utf-8"))
+
+    sessions, index = handler.sessions_from_snapshot(json.loads(json.dumps(snapshot)))
+    built = handler.build_session_index(sessions)
+
+    for field in fields(handler.SessionIndex):
+        if field.name != "term_postings":
+            assert getattr(index, field.name) == getattr(built, field.name), field.name
+    assert {term: [tuple(p) for p in postings] for term, postings in index.term_postings.items()} == \
+        {term: [tuple(p) for p in postings] for term, postings in built.term_postings.items()}
+
+
+def test_snapshot_version_is_content_hash():
+    """Test that the snapshot version changes with the source content"""
+    source = b'{"sessions": []}'
+
+    snapshot = handler.compile_sessions_snapshot(source)
+
+    assert snapshot["version"] == handler.content_version(source)
+    assert snapshot["version"] != handler.content_version(b'{"sessions": [{}]}')
+
+
+def test_preload_data_loads_all_objects(s3_mock):
+    """Test that preload_data fills the three caches"""
+    loaded = handler.preload_data()
+
+    assert set(loaded) == {"sessions", "speakers", "llms.txt"}
+    assert handler._sessions_cache is not None
+    assert handler._speakers_cache is not None
+    assert handler._llms_txt_cache is not None
+
+
+def test_preload_data_degrades_per_object(s3_mock):
+    """Test that one failing object does not prevent loading the others"""
+    import boto3
+    s3_client = boto3.client("s3", region_name="us-east-1")
+    s3_client.delete_object(Bucket="test-adoptai-bucket", Key="data/speakers.json")
+
+    loaded = handler.preload_data()
+
+    assert "speakers" not in loaded
+    assert handler._speakers_cache is None
+    assert len(loaded["sessions"]) == 3
+
+
+def test_warm_up_skips_failed_objects(s3_mock):
+    """Test that warm_up pre-renders only what could be loaded"""
+    import boto3
+    s3_client = boto3.client("s3", region_name="us-east-1")
+    s3_client.delete_object(Bucket="test-adoptai-bucket", Key="data/sessions.json")
+
+    handler.warm_up()
+
+    assert handler.response_cache_key("/sessions", {}) not in handler._response_cache
+    assert handler.response_cache_key("/speakers", {}) in handler._response_cache
+
+
+def update_sessions_json(sample_sessions_data, title):
+    """Upload a modified sessions.json to the mocked bucket"""
+    import boto3
+    data = json.loads(json.dumps(sample_sessions_data))
+    data["sessions"][0]["title"] = title
+    boto3.client("s3", region_name="us-east-1").put_object(
+        Bucket="test-adoptai-bucket",
+        Key="data/sessions.json",
+        Body=json.dumps(data).encode("utf-8"),
+    )
+
+
+def test_refresh_data_unchanged_objects(s3_mock):
+    """Test that unchanged objects are not reloaded"""
+    handler.get_sessions()
+    handler.get_speakers()
+
+    handler.refresh_data()
+
+    assert handler._pending_data == {}
+
+
+def test_refresh_data_swaps_changed_sessions(s3_mock, sample_sessions_data):
+    """Test that a changed sessions.json is rebuilt and installed between requests"""
+    old_sessions = handler.get_sessions()
+    handler.get_speakers()
+    handler.warm_up()
+    update_sessions_json(sample_sessions_data, "AI in Banking (moved)")
+
+    handler.refresh_data()
+
+    # Still serving the current data until the swap
+    assert handler.get_sessions() is old_sessions
+
+    handler.install_pending_data()
+    sessions = handler.get_sessions()
+
+    assert sessions is not old_sessions
+    assert sessions[0].title == "AI in Banking (moved)"
+    assert handler._sessions_index.sessions is sessions
+    assert handler.response_cache_key("/sessions", {}) not in handler._response_cache
+
+
+def test_refresh_data_after_snapshot_uses_conditional_get(s3_mock, sample_sessions_data, sample_speakers_data):
+    """Test that data loaded from a snapshot is checked with a conditional GET from the start"""
+    put_snapshots(sample_sessions_data, sample_speakers_data)
+    handler.get_sessions()
+    handler.get_speakers()
+    assert handler._data_etags["data/sessions.json"] == handler.source_etag(
+        json.dumps(sample_sessions_data).encode("utf-8")
+    )
+
+    with patch.object(handler, "fetch_if_modified", wraps=handler.fetch_if_modified) as fetch:
+        handler.refresh_data()
+
+    assert [c.args[0] for c in fetch.call_args_list] == ["data/sessions.json", "data/speakers.json"]
+    assert handler._pending_data == {}
+
+    update_sessions_json(sample_sessions_data, "Changed")
+    handler.refresh_data()
+    assert handler._pending_data["sessions"][0][0].title == "Changed"
+
+
+def test_refresh_data_raw_file_changed_before_first_check(s3_mock, sample_sessions_data, sample_speakers_data):
+    """Test that a fix uploaded after the deploy reaches instances started from the snapshot"""
+    put_snapshots(sample_sessions_data, sample_speakers_data)
+    update_sessions_json(sample_sessions_data, "AI in Banking (moved)")
+    assert handler.get_sessions()[0].title == "AI in Banking"
+    handler.get_speakers()
+
+    handler.refresh_data()
+    handler.install_pending_data()
+
+    assert handler.get_sessions()[0].title == "AI in Banking (moved)"
+    assert "speakers" not in handler._pending_data
+
+
+def test_maybe_refresh_data_respects_interval(s3_mock, monkeypatch):
+    """Test that checks start at most once per interval"""
+    monkeypatch.setattr(handler, "DATA_REFRESH_SECONDS", 30)
+    monkeypatch.setattr(handler, "_last_refresh_check", float("-inf"))
+    started = []
+
+    class ImmediateThread:
+        def __init__(self, target, daemon):
+            self.target = target
+
+        def start(self):
+            started.append(self.target)
+            self.target()
+
+    monkeypatch.setattr(handler.threading, "Thread", ImmediateThread)
+    handler.get_sessions()
+    handler.get_speakers()
+
+    handler.maybe_refresh_data()
+    handler.maybe_refresh_data()
+
+    assert len(started) == 1
+    assert not handler._refresh_lock.locked()
+
+
+def test_maybe_refresh_data_disabled_by_default(s3_mock, monkeypatch):
+    """Test that no check runs when DATA_REFRESH_SECONDS is 0"""
+    monkeypatch.setattr(handler, "DATA_REFRESH_SECONDS", 0)
+
+    with patch("handler.threading.Thread") as thread:
+        handler.maybe_refresh_data()
+
+    thread.assert_not_called()
+
+
+def test_changes_after_refresh_lists_modified_session(s3_mock, sample_sessions_data):
+    """Test that /changes reports the sessions changed by a reload"""
+    version = handler.get_data_version()
+    update_sessions_json(sample_sessions_data, "AI in Banking (moved)")
+    handler.refresh_data()
+    handler.install_pending_data()
+
+    data = json.loads(handler.route_request("/changes", {"since": [version]}, None)["body"])
+
+    assert data["since"] == version
+    assert data["version"] != version
+    assert data["count"] == 1
+    assert [s["title"] for s in data["sessions"]["modified"]] == ["AI in Banking (moved)"]
+    assert data["sessions"]["added"] == [] and data["sessions"]["removed"] == []
+    assert data["speakers"] == {"added": [], "modified": [], "removed": []}
+
+
+def test_data_version_same_from_snapshot(s3_mock, sample_sessions_data, sample_speakers_data):
+    """Test that the version only depends on the content, not on how it was loaded"""
+    from_json = handler.get_data_version()
+
+    put_snapshots(sample_sessions_data, sample_speakers_data)
+    handler._sessions_cache = None
+    handler._speakers_cache = None
+
+    assert handler.get_data_version() == from_json
+
@@ -273,3 +273,243 @@ def test_speakers_search_no_results(s3_mock, api_event):
     assert response["statusCode"] == 200
     assert data["count"] == 0
     assert len(data["speakers"]) == 0
+
+
+def test_sessions_now_body_reused_until_next_boundary(s3_mock, api_event):
+    """Test that now=true only patches currentTime while nothing changes"""
+    event = api_event(method="GET", path="/sessions", query_string="now=true")
+    first_time = datetime(2025, 11, 25, 9, 40, 0, tzinfo=ZoneInfo("Europe/Paris"))
+    later_time = datetime(2025, 11, 25, 9, 45, 30, tzinfo=ZoneInfo("Europe/Paris"))
+
+    with patch('handler.get_paris_now', return_value=first_time):
+        first = json.loads(handler.handler(event, None)["body"])
+    entry = handler._now_cache
+
+    with patch('handler.get_paris_now', return_value=later_time):
+        later = json.loads(handler.handler(event, None)["body"])
+
+    assert handler._now_cache is entry
+    assert later["currentTime"] != first["currentTime"]
+    assert later["ongoing"] == first["ongoing"]
+
+
+def test_sessions_now_recomputed_after_session_ends(s3_mock, api_event):
+    """Test that the cached now=true answer expires at a session end"""
+    event = api_event(method="GET", path="/sessions", query_string="now=true")
+    during = datetime(2025, 11, 25, 9, 45, 0, tzinfo=ZoneInfo("Europe/Paris"))
+    after = datetime(2025, 11, 25, 10, 0, 1, tzinfo=ZoneInfo("Europe/Paris"))
+
+    with patch('handler.get_paris_now', return_value=during):
+        data = json.loads(handler.handler(event, None)["body"])
+    assert data["ongoing"]["count"] == 1
+
+    with patch('handler.get_paris_now', return_value=after):
+        data = json.loads(handler.handler(event, None)["body"])
+    assert data["ongoing"]["count"] == 0
+
+
+def test_sessions_limit_and_cursor(s3_mock, api_event):
+    """Test paging through sessions with limit and nextCursor"""
+    event = api_event(method="GET", path="/sessions", query_string="limit=2")
+    first = json.loads(handler.handler(event, None)["body"])
+
+    assert first["count"] == 2
+    assert first["matched"] == 3
+    assert [s["id"] for s in first["sessions"]] == ["session-1", "session-2"]
+    assert first["nextCursor"] is not None
+
+    event = api_event(method="GET", path="/sessions",
+                      query_string=f"limit=2&cursor={first['nextCursor']}")
+    second = json.loads(handler.handler(event, None)["body"])
+
+    assert [s["id"] for s in second["sessions"]] == ["session-3"]
+    assert second["nextCursor"] is None
+
+
+def test_sessions_without_limit_keep_original_shape(s3_mock, api_event):
+    """Test that unpaged responses have no pagination fields"""
+    event = api_event(method="GET", path="/sessions")
+    data = json.loads(handler.handler(event, None)["body"])
+
+    assert list(data) == ["total", "count", "filters", "sessions"]
+
+
+def test_sessions_fields_projection(s3_mock, api_event):
+    """Test that fields= restricts each session to the requested fields"""
+    event = api_event(method="GET", path="/sessions", query_string="fields=id,title&stage=CEO Stage")
+    data = json.loads(handler.handler(event, None)["body"])
+
+    assert data["count"] == 2
+    assert data["sessions"][0] == {"id": "session-1", "title": "AI in Banking"}
+
+
+def test_sessions_unknown_field_is_bad_request(s3_mock, api_event):
+    """Test that an unknown projected field returns 400"""
+    event = api_event(method="GET", path="/sessions", query_string="fields=id,description")
+    response = handler.handler(event, None)
+    data = json.loads(response["body"])
+
+    assert response["statusCode"] == 400
+    assert data["error"] == "Bad Request"
+    assert "description" in data["message"]
+
+
+@pytest.mark.parametrize("query", [
+    "limit=0", "limit=abc", "limit=100000", "limit=2&cursor=x", "limit=%C2%B2", "limit=5&cursor=%C2%B2",
+])
+def test_sessions_invalid_paging_is_bad_request(s3_mock, api_event, query):
+    """Test that invalid limit/cursor values return 400"""
+    event = api_event(method="GET", path="/sessions", query_string=query)
+
+    assert handler.handler(event, None)["statusCode"] == 400
+
+
+def test_speakers_fields_and_limit(s3_mock, api_event):
+    """Test pagination and projection on /speakers"""
+    event = api_event(method="GET", path="/speakers", query_string="fields=name&limit=1")
+    data = json.loads(handler.handler(event, None)["body"])
+
+    assert data["speakers"] == [{"name": "John Doe"}]
+    assert data["matched"] == 2
+    assert data["nextCursor"] == "1"
+
+
+def test_sessions_ndjson_one_session_per_line(s3_mock, api_event):
+    """Test that format=ndjson returns the filtered sessions one per line"""
+    event = api_event(method="GET", path="/sessions", query_string="format=ndjson&stage=CEO Stage")
+    response = handler.handler(event, None)
+    lines = response["body"].splitlines()
+
+    assert response["statusCode"] == 200
+    assert response["headers"]["Content-Type"].startswith("application/x-ndjson")
+    assert response["body"].endswith("\n")
+    assert [json.loads(line)["id"] for line in lines] == ["session-1", "session-3"]
+
+
+def test_sessions_ndjson_matches_json_records(s3_mock, api_event):
+    """Test that NDJSON lines are the same records as the JSON envelope"""
+    as_json = json.loads(handler.handler(api_event(method="GET", path="/sessions"), None)["body"])
+    as_ndjson = handler.handler(api_event(method="GET", path="/sessions", query_string="format=ndjson"), None)
+
+    assert [json.loads(line) for line in as_ndjson["body"].splitlines()] == as_json["sessions"]
+
+
+def test_speakers_ndjson_with_fields_and_limit(s3_mock, api_event):
+    """Test that NDJSON honors fields and limit/cursor"""
+    event = api_event(method="GET", path="/speakers", query_string="format=ndjson&fields=name&limit=1&cursor=1")
+    response = handler.handler(event, None)
+
+    assert response["body"] == '{"name": "Jane Smith"}\n'
+
+
+def test_unknown_format_is_bad_request(s3_mock, api_event):
+    """Test that an unknown format returns 400"""
+    event = api_event(method="GET", path="/speakers", query_string="format=xml")
+
+    assert handler.handler(event, None)["statusCode"] == 400
+
+
+def test_sessions_sort_by_relevance(s3_mock, api_event):
+    """Test that sort=relevance puts the best scored matches first"""
+    plain = api_event(method="GET", path="/sessions", query_string="search=ai")
+    ranked = api_event(method="GET", path="/sessions", query_string="search=ai&sort=relevance")
+
+    plain_ids = [s["id"] for s in json.loads(handler.handler(plain, None)["body"])["sessions"]]
+    ranked_ids = [s["id"] for s in json.loads(handler.handler(ranked, None)["body"])["sessions"]]
+
+    assert plain_ids == ["session-1", "session-3"]
+    # session-3 also has "ai" as ecosystem
+    assert ranked_ids == ["session-3", "session-1"]
+
+
+def test_sessions_relevance_pages(s3_mock, api_event):
+    """Test that ranked top-k pages keep the total match count"""
+    first = api_event(method="GET", path="/sessions", query_string="search=ai&sort=relevance&limit=1")
+    data = json.loads(handler.handler(first, None)["body"])
+
+    assert [s["id"] for s in data["sessions"]] == ["session-3"]
+    assert data["matched"] == 2
+    assert data["nextCursor"] == "1"
+
+    second = api_event(method="GET", path="/sessions",
+                       query_string=f"search=ai&sort=relevance&limit=1&cursor={data['nextCursor']}")
+    data = json.loads(handler.handler(second, None)["body"])
+
+    assert [s["id"] for s in data["sessions"]] == ["session-1"]
+    assert data["nextCursor"] is None
+
+
+def test_sessions_unknown_sort_is_bad_request(s3_mock, api_event):
+    """Test that an unknown sort order returns 400"""
+    event = api_event(method="GET", path="/sessions", query_string="sort=date")
+
+    assert handler.handler(event, None)["statusCode"] == 400
+
+
+def test_sessions_search_ignores_accents(s3_mock, api_event):
+    """Test that accented queries match unaccented text and vice versa"""
+    event = api_event(method="GET", path="/sessions", query_string="search=Anthrópic")
+    data = json.loads(handler.handler(event, None)["body"])
+
+    assert [s["id"] for s in data["sessions"]] == ["session-3"]
+
+
+def test_sessions_search_tolerates_typos(s3_mock, api_event):
+    """Test that a misspelled search falls back to close words"""
+    event = api_event(method="GET", path="/sessions", query_string="search=antrhopic")
+    data = json.loads(handler.handler(event, None)["body"])
+
+    assert [s["id"] for s in data["sessions"]] == ["session-3"]
+
+
+def test_speakers_search_tolerates_typos(s3_mock, api_event):
+    """Test the typo-tolerant fallback on /speakers"""
+    event = api_event(method="GET", path="/speakers", query_string="search=jane smiht")
+    data = json.loads(handler.handler(event, None)["body"])
+
+    assert [sp["name"] for sp in data["speakers"]] == ["Jane Smith"]
+
+
+def test_typo_answers_are_flagged(s3_mock, api_event):
+    """Test that answers of the fuzzy fallback carry fuzzy: true"""
+    fuzzy = api_event(method="GET", path="/sessions", query_string="search=antrhopic")
+    exact = api_event(method="GET", path="/sessions", query_string="search=anthropic")
+    speakers = api_event(method="GET", path="/speakers", query_string="search=jane smiht")
+
+    assert json.loads(handler.handler(fuzzy, None)["body"])["fuzzy"] is True
+    assert "fuzzy" not in json.loads(handler.handler(exact, None)["body"])
+    assert json.loads(handler.handler(speakers, None)["body"])["fuzzy"] is True
+
+
+def test_filtered_out_exact_matches_stay_empty(s3_mock, api_event):
+    """Test that the fallback is not used when the filters exclude exact matches"""
+    event = api_event(method="GET", path="/sessions", query_string="stage=Mainstage South&search=banking")
+    data = json.loads(handler.handler(event, None)["body"])
+
+    assert data["count"] == 0
+    assert "fuzzy" not in data
+
+
+def test_exact_matches_take_precedence_over_typos(s3_mock, api_event):
+    """Test that the fuzzy fallback is not used when something matches exactly"""
+    event = api_event(method="GET", path="/speakers", query_string="search=john")
+    data = json.loads(handler.handler(event, None)["body"])
+
+    assert [sp["name"] for sp in data["speakers"]] == ["John Doe"]
+
+
+def test_sessions_with_facets(s3_mock, api_event):
+    """Test that facets= adds counts of the filtered set to /sessions"""
+    event = api_event(method="GET", path="/sessions", query_string="stage=CEO Stage&facets=ecosystem")
+    data = json.loads(handler.handler(event, None)["body"])
+
+    assert data["count"] == 2
+    assert data["facets"] == {"ecosystem": {"ai": 1, "finance": 1}}
+
+
+def test_sessions_without_facets_have_no_facets_key(s3_mock, api_event):
+    """Test that facets are only added on request"""
+    event = api_event(method="GET", path="/sessions")
+    data = json.loads(handler.handler(event, None)["body"])
+
+    assert "facets" not in data
@@ -1,7 +1,8 @@
 """Tests for helper functions"""
 
+import json
 import pytest
-from datetime import datetime
+from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 from unittest.mock import patch
 import handler
@@ -295,3 +296,727 @@ class TestFilterSessionsByNow:
 
         # Should assume 20 min duration, so still ongoing at 9:35
         assert len(result["ongoing"]) == 1
+
+
+class TestSessionSearchIndex:
+    """Tests for the n-gram search index used by filter_sessions"""
+
+    sessions = [
+        {
+            "id": "session-1",
+            "title": "AI in Banking",
+            "speakers": [{"name": "John Doe", "company": "BigBank", "title": "CEO"}],
+            "ecosystems": ["finance"],
+        },
+        {
+            "id": "session-2",
+            "title": "Banks and Clouds",
+            "speakers": [],
+            "ecosystems": ["cloud"],
+        },
+    ]
+
+    def test_iter_bits_preserves_order(self):
+        """Test that iter_bits yields positions lowest first"""
+        assert list(handler.iter_bits(0b10110)) == [1, 2, 4]
+        assert list(handler.iter_bits(0)) == []
+
+    def test_substring_match_inside_word(self):
+        """Test that substrings in the middle of a word still match"""
+        index = handler.build_session_index(self.sessions)
+
+        assert list(handler.iter_bits(handler.search_sessions(index, "ankin"))) == [0]
+        assert list(handler.iter_bits(handler.search_sessions(index, "BANK"))) == [0, 1]
+
+    def test_match_spanning_words(self):
+        """Test that queries containing spaces match within one field"""
+        index = handler.build_session_index(self.sessions)
+
+        assert list(handler.iter_bits(handler.search_sessions(index, "john doe"))) == [0]
+
+    def test_ngrams_from_different_fields_do_not_match(self):
+        """Test that candidates sharing all n-grams are verified"""
+        index = handler.build_session_index(self.sessions)
+
+        # "fin" and "ance" come from "finance" but "nancefin" is not a substring
+        assert handler.search_sessions(index, "nancefin") == 0
+
+    def test_short_query_scans_fields(self):
+        """Test that queries shorter than NGRAM_SIZE still match"""
+        index = handler.build_session_index(self.sessions)
+
+        assert list(handler.iter_bits(handler.search_sessions(index, "ai"))) == [0]
+
+    def test_get_sessions_builds_index(self, s3_mock):
+        """Test that get_sessions builds the index next to the cache"""
+        sessions = handler.get_sessions()
+
+        assert handler._sessions_index is not None
+        assert handler.get_session_index(sessions) is handler._sessions_index
+
+
+class TestSessionFilterIndex:
+    """Tests for the date/stage/time bitsets of the session index"""
+
+    sessions = [
+        {"id": "s1", "date": "Nov 25, 2025", "startTime": "9:30 AM", "stage": "CEO Stage"},
+        {"id": "s2", "date": "Nov 25, 2025", "startTime": "2:00 PM", "stage": "Mainstage South"},
+        {"id": "s3", "date": "Nov 26, 2025", "startTime": "12:00 PM", "stage": "CEO Stage"},
+        {"id": "s4", "date": "Nov 26, 2025", "stage": ""},
+    ]
+
+    def test_time_of_day_masks(self):
+        """Test morning/afternoon bitsets, noon being afternoon"""
+        index = handler.build_session_index(self.sessions)
+
+        assert list(handler.iter_bits(index.morning_mask)) == [0]
+        assert list(handler.iter_bits(index.afternoon_mask)) == [1, 2]
+
+    def test_values_are_grouped(self):
+        """Test that distinct dates and stages each get one bitset"""
+        index = handler.build_session_index(self.sessions)
+
+        assert index.dates == {"Nov 25, 2025": 0b0011, "Nov 26, 2025": 0b1100}
+        assert index.stages["ceo stage"] == 0b0101
+
+    def test_combined_filters_intersect(self):
+        """Test that combined filters keep file order"""
+        params = {"date": ["2025-11-26"], "stage": ["ceo"], "time": ["afternoon"]}
+
+        result = handler.filter_sessions(self.sessions, params)
+
+        assert [s["id"] for s in result] == ["s3"]
+
+    def test_unknown_time_value_is_ignored(self):
+        """Test that an unknown time value does not filter"""
+        result = handler.filter_sessions(self.sessions, {"time": ["evening"]})
+
+        assert len(result) == 4
+
+
+class TestResponseCache:
+    """Tests for the LRU response body cache"""
+
+    def test_key_ignores_parameter_order(self):
+        """Test that parameter order does not change the cache key"""
+        key1 = handler.response_cache_key("/sessions", {"a": ["1"], "b": ["2"]})
+        key2 = handler.response_cache_key("/sessions", {"b": ["2"], "a": ["1"]})
+
+        assert key1 == key2
+
+    def test_evicts_least_recently_used(self, monkeypatch):
+        """Test size-based eviction of the least recently used entry"""
+        monkeypatch.setattr(handler, "RESPONSE_CACHE_MAX_BYTES", 10)
+
+        handler.put_cached_body(("a",), "xxxx")
+        handler.put_cached_body(("b",), "xxxx")
+        handler.get_cached_body(("a",))
+        handler.put_cached_body(("c",), "xxxx")
+
+        assert handler.get_cached_body(("b",)) is None
+        assert handler.get_cached_body(("a",)) == "xxxx"
+        assert handler._response_cache_bytes == 8
+
+    def test_oversized_body_not_cached(self, monkeypatch):
+        """Test that bodies larger than the budget are not cached"""
+        monkeypatch.setattr(handler, "RESPONSE_CACHE_MAX_BYTES", 3)
+
+        handler.put_cached_body(("a",), "xxxx")
+
+        assert handler.get_cached_body(("a",)) is None
+
+
+class TestNegotiateEncoding:
+    """Tests for negotiate_encoding function"""
+
+    def test_gzip_accepted(self):
+        """Test that gzip is picked when listed"""
+        assert handler.negotiate_encoding("gzip, deflate") == "gzip"
+
+    def test_no_header_means_identity(self):
+        """Test that an empty header disables compression"""
+        assert handler.negotiate_encoding("") is None
+
+    def test_zero_quality_refuses_encoding(self):
+        """Test that q=0 excludes an encoding"""
+        assert handler.negotiate_encoding("gzip;q=0, identity") is None
+
+    def test_wildcard_accepts_gzip(self, monkeypatch):
+        """Test that * allows gzip"""
+        monkeypatch.setattr(handler, "brotli", None)
+
+        assert handler.negotiate_encoding("*") == "gzip"
+
+    def test_brotli_preferred_when_available(self, monkeypatch):
+        """Test that br wins over gzip when the brotli module is installed"""
+        monkeypatch.setattr(handler, "brotli", object())
+
+        assert handler.negotiate_encoding("gzip, br") == "br"
+        assert handler.negotiate_encoding("gzip;q=1.0, br;q=0.5") == "gzip"
+
+    def test_brotli_ignored_when_unavailable(self, monkeypatch):
+        """Test that br is never picked without the brotli module"""
+        monkeypatch.setattr(handler, "brotli", None)
+
+        assert handler.negotiate_encoding("br") is None
+
+
+class TestNegotiateMediaType:
+    """Tests for negotiate_media_type function"""
+
+    def test_json_by_default(self):
+        """Test that a missing header or wildcard keeps JSON"""
+        assert handler.negotiate_media_type("") == "application/json"
+        assert handler.negotiate_media_type("*/*") == "application/json"
+
+    def test_binary_types_when_listed(self):
+        """Test that msgpack and cbor are picked when asked for"""
+        assert handler.negotiate_media_type("application/msgpack") == "application/msgpack"
+        assert handler.negotiate_media_type("application/cbor, */*;q=0.1") == "application/cbor"
+
+    def test_msgpack_aliases(self):
+        """Test that the unregistered msgpack media types are understood"""
+        assert handler.negotiate_media_type("application/x-msgpack") == "application/msgpack"
+        assert handler.negotiate_media_type("application/vnd.msgpack") == "application/msgpack"
+
+    def test_json_preferred_by_quality(self):
+        """Test that JSON wins when ranked higher than the binary type"""
+        assert handler.negotiate_media_type("application/json, application/cbor;q=0.5") == "application/json"
+        assert handler.negotiate_media_type("application/msgpack;q=0") == "application/json"
+
+
+class TestEtagMatches:
+    """Tests for etag_matches function"""
+
+    def test_exact_match(self):
+        """Test matching the same weak ETag"""
+        assert handler.etag_matches('W/"abc"', 'W/"abc"')
+
+    def test_weak_comparison(self):
+        """Test that strong and weak forms of a tag match"""
+        assert handler.etag_matches('"abc"', 'W/"abc"')
+
+    def test_list_of_tags(self):
+        """Test matching one tag among several"""
+        assert handler.etag_matches('W/"x", W/"abc"', 'W/"abc"')
+
+    def test_wildcard(self):
+        """Test that * matches any ETag"""
+        assert handler.etag_matches("*", 'W/"abc"')
+
+    def test_no_match(self):
+        """Test different and empty headers"""
+        assert not handler.etag_matches('W/"x"', 'W/"abc"')
+        assert not handler.etag_matches("", 'W/"abc"')
+
+
+class TestSessionIntervalIndex:
+    """Tests for the start-time index behind filter_sessions_by_now"""
+
+    paris = ZoneInfo("Europe/Paris")
+
+    def make_session(self, session_id, start, end):
+        return {
+            "id": session_id,
+            "_start_dt": datetime(2025, 11, 25, *start, tzinfo=self.paris),
+            "_end_dt": datetime(2025, 11, 25, *end, tzinfo=self.paris) if end else None,
+        }
+
+    def test_start_times_sorted_with_fallback_end(self):
+        """Test that starts are sorted and missing ends use the fallback"""
+        sessions = [
+            self.make_session("late", (11, 0), (11, 30)),
+            self.make_session("early", (9, 0), None),
+        ]
+
+        index = handler.build_session_index(sessions)
+
+        assert index.start_positions == [1, 0]
+        assert index.end_times[0] - index.start_times[0] == 20 * 60
+        assert index.running_bounds == sorted(index.start_times + index.end_times)
+
+    def test_long_session_still_ongoing(self):
+        """Test that a long session is found among short later ones"""
+        sessions = [
+            self.make_session("short", (10, 50), (11, 0)),
+            self.make_session("long", (9, 0), (12, 0)),
+            self.make_session("next", (11, 20), (11, 40)),
+        ]
+        mock_time = datetime(2025, 11, 25, 11, 5, 0, tzinfo=self.paris)
+
+        with patch('handler.get_paris_now', return_value=mock_time):
+            result = handler.filter_sessions_by_now(sessions)
+
+        assert [s["id"] for s in result["ongoing"]] == ["long"]
+        assert [s["id"] for s in result["upcoming"]] == ["next"]
+
+    def test_results_keep_file_order(self):
+        """Test that ongoing sessions are returned in file order"""
+        sessions = [
+            self.make_session("b", (10, 30), (11, 30)),
+            self.make_session("a", (10, 0), (11, 30)),
+        ]
+        mock_time = datetime(2025, 11, 25, 11, 0, 0, tzinfo=self.paris)
+
+        with patch('handler.get_paris_now', return_value=mock_time):
+            result = handler.filter_sessions_by_now(sessions)
+
+        assert [s["id"] for s in result["ongoing"]] == ["b", "a"]
+
+
+class TestSessionsAt:
+    """Tests for the validity boundary returned by sessions_at"""
+
+    paris = ZoneInfo("Europe/Paris")
+
+    def test_boundary_is_next_change(self):
+        """Test that the boundary is the earliest end, start or window entry"""
+        sessions = [
+            {"_start_dt": datetime(2025, 11, 25, 9, 0, tzinfo=self.paris),
+             "_end_dt": datetime(2025, 11, 25, 9, 50, tzinfo=self.paris)},
+            {"_start_dt": datetime(2025, 11, 25, 10, 0, tzinfo=self.paris),
+             "_end_dt": datetime(2025, 11, 25, 10, 30, tzinfo=self.paris)},
+            {"_start_dt": datetime(2025, 11, 25, 10, 20, tzinfo=self.paris),
+             "_end_dt": datetime(2025, 11, 25, 10, 40, tzinfo=self.paris)},
+        ]
+        index = handler.build_session_index(sessions)
+        now = datetime(2025, 11, 25, 9, 40, tzinfo=self.paris)
+
+        ongoing, upcoming, valid_until = handler.sessions_at(index, now.timestamp())
+
+        assert ongoing == [0]
+        assert upcoming == [1]
+        # Session 2 enters the 30 minute window at 9:50, same as session 0's end
+        assert valid_until == datetime(2025, 11, 25, 9, 50, tzinfo=self.paris).timestamp()
+
+    def test_no_more_sessions(self):
+        """Test that the answer never expires after the last session"""
+        index = handler.build_session_index([])
+
+        assert handler.sessions_at(index, 0.0) == ([], [], float("inf"))
+
+    def test_ongoing_with_an_all_day_entry(self):
+        """Test that ongoing sessions match start <= now <= end with a day-long entry"""
+        day = datetime(2025, 11, 25, tzinfo=self.paris)
+        sessions = [
+            {"_start_dt": day + timedelta(hours=8), "_end_dt": day + timedelta(hours=19)},
+        ] + [
+            {"_start_dt": day + timedelta(hours=9, minutes=20 * i),
+             "_end_dt": day + timedelta(hours=9, minutes=20 * i + 30)}
+            for i in range(20)
+        ]
+        index = handler.build_session_index(sessions)
+
+        for minutes in range(7 * 60, 20 * 60, 5):
+            now_ts = (day + timedelta(minutes=minutes)).timestamp()
+            ongoing, _, valid_until = handler.sessions_at(index, now_ts)
+
+            assert ongoing == [
+                pos for pos, s in enumerate(sessions)
+                if s["_start_dt"].timestamp() <= now_ts <= s["_end_dt"].timestamp()
+            ]
+            assert valid_until >= now_ts
+
+
+class TestJsonAssembly:
+    """Tests for bodies assembled from pre-encoded fragments"""
+
+    def test_encode_object_matches_json_dumps(self):
+        """Test that assembled objects are laid out exactly like json.dumps"""
+        value = {"count": 2, "items": [{"a": "é"}, {"b": None}], "next": None}
+        members = [
+            ("count", "2"),
+            ("items", handler.encode_array(json.dumps(v, ensure_ascii=False) for v in value["items"])),
+            ("next", "null"),
+        ]
+
+        assert handler.encode_object(members) == json.dumps(value, ensure_ascii=False)
+
+    def test_empty_array_and_object(self):
+        """Test the empty cases"""
+        assert handler.encode_array([]) == "[]"
+        assert handler.encode_object([]) == "{}"
+
+    def test_records_use_precomputed_fragment(self):
+        """Test that full records reuse their fragment and projections are encoded"""
+        session = handler.as_session({"id": "s1", "title": "Talk", "stage": "CEO Stage"})
+
+        assert handler.encode_records([session], None) == [session.fragment]
+        assert handler.encode_records([session], ("id",)) == ['{"id": "s1"}']
+
+    def test_projection_matches_json_dumps(self):
+        """Test that projections keep the requested order and match json.dumps"""
+        session = handler.as_session({
+            "id": "s1", "title": "Café \"IA\"", "stage": "CEO Stage",
+            "speakers": [{"name": "Łukasz", "company": "Ørsted"}],
+        })
+        fields = ("speakers", "id", "unknown", "title")
+        expected = {f: session.public[f] for f in fields if f in session.public}
+
+        assert handler.encode_records([session], fields) == [json.dumps(expected, ensure_ascii=False)]
+        assert handler.encode_records([session], ()) == ["{}"]
+        assert session.members is not None
+
+
+class TestJoinIndex:
+    """Tests for the session <-> speaker join index"""
+
+    def test_session_positions_by_id(self):
+        """Test that the session index maps ids to positions"""
+        sessions = [handler.as_session({"id": "s1"}), handler.as_session({"id": "s2"})]
+
+        assert handler.build_session_index(sessions).positions == {"s1": 0, "s2": 1}
+
+    def test_slugify(self):
+        """Test that slugs drop accents, case and punctuation"""
+        assert handler.slugify("Florence Bénézit") == "florence-benezit"
+        assert handler.slugify("  Jean-Luc O'Neil ") == "jean-luc-o-neil"
+        assert handler.slugify("Chris O’Brien") == "chris-obrien"
+
+    def test_slugify_keeps_letters_without_ascii_form(self):
+        """Test that letters NFKD cannot decompose stay in the slug"""
+        assert handler.slugify("Łukasz Ørsted") == "łukasz-ørsted"
+        assert handler.slugify("Gerhard Kreß") == "gerhard-kress"
+        assert handler.slugify("山田 太郎") == "山田-太郎"
+
+    def test_names_without_letters_get_positional_slug(self):
+        """Test that a name with no letter or digit is still addressable"""
+        speakers = handler.speakers_from_json({"speakers": [{"name": "Ana"}, {"name": "—"}]})
+
+        join = handler.build_join_index([], speakers)
+
+        assert join.speaker_slugs == ["ana", "speaker-2"]
+
+    def test_links_follow_session_speaker_order(self):
+        """Test that a session lists its speakers in its own order"""
+        sessions = [
+            handler.as_session({"id": "s1", "speakers": [{"name": "B"}, {"name": "A"}]}),
+            handler.as_session({"id": "s2"}),
+        ]
+        speakers = handler.speakers_from_json({"speakers": [
+            {"name": "A", "sessions": [{"sessionId": "s1"}, {"sessionId": "s2"}]},
+            {"name": "B", "sessions": [{"sessionId": "s1"}, {"sessionId": "missing"}]},
+        ]})
+
+        join = handler.build_join_index(sessions, speakers)
+
+        assert join.session_speakers == [[1, 0], [0]]
+        assert join.speaker_sessions == [[0, 1], [0]]
+
+    def test_colliding_slugs_get_suffix(self):
+        """Test that speakers with the same slug stay addressable"""
+        speakers = handler.speakers_from_json({"speakers": [
+            {"name": "FLORENCE BENEZIT"}, {"name": "Florence Bénézit"},
+        ]})
+
+        join = handler.build_join_index([], speakers)
+
+        assert join.speaker_positions == {"florence-benezit": 0, "florence-benezit-2": 1}
+        assert join.speaker_slugs == ["florence-benezit", "florence-benezit-2"]
+        assert join.speaker_names == {"FLORENCE BENEZIT": 0, "Florence Bénézit": 1}
+
+
+class TestRelevanceRanking:
+    """Tests for BM25F scoring of ?sort=relevance"""
+
+    sessions = [
+        {"id": "s1", "title": "Cloud costs", "speakers": [{"name": "Ann", "company": "Bank Corp"}]},
+        {"id": "s2", "title": "Banking with AI", "speakers": []},
+        {"id": "s3", "title": "Open banking and banking APIs", "speakers": []},
+        {"id": "s4", "title": "Robotics", "speakers": []},
+    ]
+
+    def test_title_outranks_company(self):
+        """Test that field weights favor title matches"""
+        index = handler.build_session_index(self.sessions)
+        scores = handler.score_sessions(index, "bank")
+
+        assert set(scores) == {0, 1, 2}
+        assert scores[1] > scores[0]
+
+    def test_term_frequency_counts(self):
+        """Test that repeated terms score higher, with saturation"""
+        index = handler.build_session_index(self.sessions)
+
+        assert handler.rank_sessions(index, index.all_mask, "banking") == [2, 1, 0, 3]
+
+    def test_top_k_matches_full_ranking(self):
+        """Test that the heap selection returns the head of the full ranking"""
+        index = handler.build_session_index(self.sessions)
+        full = handler.rank_sessions(index, index.all_mask, "bank")
+
+        assert handler.rank_sessions(index, index.all_mask, "bank", 2) == full[:2]
+
+    def test_unmatched_query_keeps_file_order(self):
+        """Test that sessions without score keep file order"""
+        index = handler.build_session_index(self.sessions)
+
+        assert handler.rank_sessions(index, 0b1010, "zzz") == [1, 3]
+
+
+class TestFuzzySearch:
+    """Tests for accent folding and the typo-tolerant word index"""
+
+    def test_fold(self):
+        """Test that folding drops accents and case"""
+        assert handler.fold("Adriana Mirón") == "adriana miron"
+        assert handler.fold("CRÉDIT Mutuel") == "credit mutuel"
+
+    @pytest.mark.parametrize("a, b, distance", [
+        ("aghion", "aghion", 0),
+        ("aghoin", "aghion", 1),
+        ("miron", "mirons", 1),
+        ("finanse", "finance", 1),
+        ("banking", "bonkin", 2),
+        ("anthropic", "robotics", 3),
+    ])
+    def test_edit_distance(self, a, b, distance):
+        """Test edit distances with transpositions, capped at limit + 1"""
+        assert handler.edit_distance(a, b, 2) == min(distance, 3)
+
+    def test_fuzzy_search_requires_every_word(self):
+        """Test that each query word must match a word of the record"""
+        words = handler.build_word_index([("philippe aghion",), ("philippe martin",)])
+        grams = handler.build_word_grams(words)
+
+        assert handler.fuzzy_search(words, grams, "Philipe Aghoin", 0b11) == 0b01
+        assert handler.fuzzy_search(words, grams, "philipe", 0b11) == 0b11
+        assert handler.fuzzy_search(words, grams, "philipe", 0b10) == 0b10
+
+    def test_short_words_need_exact_match(self):
+        """Test that words below FUZZY_MIN_LENGTH get no typo allowance"""
+        words = handler.build_word_index([("ai for travel",)])
+        grams = handler.build_word_grams(words)
+
+        assert handler.fuzzy_search(words, grams, "ia", 0b1) == 0
+        assert handler.fuzzy_search(words, grams, "ai travl", 0b1) == 0b1
+
+    def test_first_letter_must_match(self):
+        """Test that a different first letter is not taken as a typo"""
+        words = handler.build_word_index([("ai in banking",)])
+        grams = handler.build_word_grams(words)
+
+        assert handler.fuzzy_search(words, grams, "ranking", 0b1) == 0
+        assert handler.fuzzy_search(words, grams, "bankng", 0b1) == 0b1
+
+    def test_no_fallback_when_filters_empty_exact_matches(self):
+        """Test that exact matches outside the filters keep the answer empty"""
+        sessions = [
+            handler.session_from_raw({"id": "a", "title": "Bank of the future", "date": "Nov 25, 2025"}),
+            handler.session_from_raw({"id": "b", "title": "Back to basics", "date": "Nov 26, 2025"}),
+        ]
+        index = handler.build_session_index(sessions)
+
+        assert handler.filter_session_mask(index, {"search": ["bank"], "date": ["2025-11-26"]}) == 0
+        assert handler.filter_session_mask(index, {"search": ["bakc"], "date": ["2025-11-26"]}) == 0b10
+        assert not handler.session_search_is_fuzzy(index, {"search": ["bank"]})
+        assert handler.session_search_is_fuzzy(index, {"search": ["bakc"]})
+
+
+class TestFacets:
+    """Tests for facet counting"""
+
+    def test_values_grouped_under_first_spelling(self):
+        """Test that spellings differing in case or accents are one value"""
+        sessions = [
+            {"id": "s1", "speakers": [{"name": "A", "company": "Société Générale"}]},
+            {"id": "s2", "speakers": [{"name": "B", "company": "SOCIETE GENERALE"}, {"name": "C", "company": ""}]},
+        ]
+        index = handler.build_session_index(sessions)
+
+        assert index.facets["company"] == {"Société Générale": 0b11}
+        assert handler.count_facets(index, 0b10, ("company",)) == {"company": {"Société Générale": 1}}
+
+    def test_counts_sorted_by_frequency(self):
+        """Test that values are ordered by count, then name"""
+        sessions = [{"id": str(i), "stage": stage} for i, stage in enumerate(["B", "A", "C", "C"])]
+        index = handler.build_session_index(sessions)
+
+        assert list(handler.count_facets(index, index.all_mask, ("stage",))["stage"].items()) == [
+            ("C", 2), ("A", 1), ("B", 1),
+        ]
+
+
+class TestScheduleSessions:
+    """Tests for the weighted interval scheduling of /itinerary"""
+
+    paris = ZoneInfo("Europe/Paris")
+
+    def make_index(self, slots):
+        sessions = [
+            handler.as_session({
+                "id": f"s{i}", "stage": stage,
+                "_start_dt": datetime(2025, 11, 25, start // 60, start % 60, tzinfo=self.paris),
+                "_end_dt": datetime(2025, 11, 25, end // 60, end % 60, tzinfo=self.paris),
+            })
+            for i, (stage, start, end) in enumerate(slots)
+        ]
+        return handler.build_session_index(sessions)
+
+    def test_picks_heaviest_compatible_set(self):
+        """Test that total weight beats the number of sessions"""
+        index = self.make_index([("A", 540, 600), ("A", 570, 630), ("A", 600, 660)])
+
+        assert handler.schedule_sessions(index, {0: 1.0, 1: 5.0, 2: 1.0}, 0) == [1]
+        assert handler.schedule_sessions(index, {0: 3.0, 1: 5.0, 2: 3.0}, 0) == [0, 2]
+
+    def test_travel_buffer_between_stages(self):
+        """Test that back-to-back sessions need the buffer only across stages"""
+        index = self.make_index([("A", 540, 600), ("A", 600, 630), ("B", 600, 630)])
+
+        assert handler.schedule_sessions(index, {0: 1.0, 1: 1.0}, 300) == [0, 1]
+        assert handler.schedule_sessions(index, {0: 1.0, 2: 1.0}, 300) == [2]
+        assert handler.schedule_sessions(index, {0: 1.0, 2: 1.0}, 0) == [0, 2]
+
+    def test_conflict_reported_for_dropped_session(self):
+        """Test that a requested session left out names what it clashes with"""
+        index = self.make_index([("A", 540, 600), ("B", 598, 640)])
+        schedule = handler.schedule_sessions(index, {0: 2.0, 1: 1.0}, 300)
+
+        assert schedule == [0]
+        assert handler.find_conflict(index, 1, schedule, 300) == 0
+
+
+class TestIcs:
+    """Tests for iCalendar rendering"""
+
+    def test_escape(self):
+        """Test escaping of TEXT values"""
+        assert handler.ics_escape("a,b;c\\d\ne") == "a\\,b\\;c\\\\d\\ne"
+
+    def test_long_lines_are_folded(self):
+        """Test that lines are folded at 75 octets without splitting characters"""
+        line = handler.ics_line("SUMMARY", "é" * 60)
+        physical = line[:-2].split("\r\n ")
+
+        assert all(len(part.encode("utf-8")) <= 75 for part in physical)
+        assert "".join(physical) == "SUMMARY:" + "é" * 60
+
+    def test_continuation_lines_fit_with_their_space(self):
+        """Test that folded lines stay within 75 octets counting the leading space"""
+        value = "a" * 70 + "😀" * 50 + "b" * 100
+        line = handler.ics_line("DESCRIPTION", value)
+        physical = line[:-2].split("\r\n")
+
+        assert len(physical[0].encode("utf-8")) <= 75
+        assert all(part.startswith(" ") and len(part.encode("utf-8")) <= 75 for part in physical[1:])
+        assert physical[0] + "".join(part[1:] for part in physical[1:]) == "DESCRIPTION:" + value
+
+    def test_vevent_without_start_is_empty(self):
+        """Test that sessions without a start time are not exported"""
+        assert handler.as_session({"id": "s1", "title": "TBD"}).vevent == ""
+
+    def test_vevent_uses_fallback_duration(self):
+        """Test that a missing end time lasts FALLBACK_DURATION"""
+        paris = ZoneInfo("Europe/Paris")
+        session = handler.as_session({
+            "id": "s1", "title": "Talk",
+            "_start_dt": datetime(2025, 11, 25, 10, 0, tzinfo=paris),
+        })
+
+        assert "DTSTART:20251125T090000Z\r\n" in session.vevent
+        assert "DTEND:20251125T092000Z\r\n" in session.vevent
+
+
+class TestBinaryEncoders:
+    """Tests for msgpack_encode and cbor_encode"""
+
+    def test_msgpack_scalars(self):
+        """Test the MessagePack encoding of each scalar type"""
+        assert handler.msgpack_encode(None) == b"\xc0"
+        assert handler.msgpack_encode([True, False]) == b"\x92\xc3\xc2"
+        assert handler.msgpack_encode(5) == b"\x05"
+        assert handler.msgpack_encode(-1) == b"\xff"
+        assert handler.msgpack_encode(200) == b"\xcc\xc8"
+        assert handler.msgpack_encode(-200) == b"\xd1\xff\x38"
+        assert handler.msgpack_encode(70000) == b"\xce\x00\x01\x11\x70"
+        assert handler.msgpack_encode(1.5) == b"\xcb\x3f\xf8\x00\x00\x00\x00\x00\x00"
+        assert handler.msgpack_encode("é") == b"\xa2\xc3\xa9"
+
+    def test_msgpack_containers(self):
+        """Test that lengths switch from the fix forms to the sized ones"""
+        assert handler.msgpack_encode({"a": [1]}) == b"\x81\xa1a\x91\x01"
+        assert handler.msgpack_encode("x" * 40)[:2] == b"\xd9\x28"
+        assert handler.msgpack_encode([0] * 20)[:3] == b"\xdc\x00\x14"
+
+    def test_cbor_scalars(self):
+        """Test the CBOR encoding of each scalar type"""
+        assert handler.cbor_encode(None) == b"\xf6"
+        assert handler.cbor_encode([True, False]) == b"\x82\xf5\xf4"
+        assert handler.cbor_encode(10) == b"\x0a"
+        assert handler.cbor_encode(-1) == b"\x20"
+        assert handler.cbor_encode(1000) == b"\x19\x03\xe8"
+        assert handler.cbor_encode(-1000) == b"\x39\x03\xe7"
+        assert handler.cbor_encode(1.5) == b"\xfb\x3f\xf8\x00\x00\x00\x00\x00\x00"
+        assert handler.cbor_encode("é") == b"\x62\xc3\xa9"
+
+    def test_cbor_containers(self):
+        """Test CBOR maps and arrays, including sized lengths"""
+        assert handler.cbor_encode({"a": [1]}) == b"\xa1\x61a\x81\x01"
+        assert handler.cbor_encode([0] * 30)[:2] == b"\x98\x1e"
+
+    def test_unsupported_type(self):
+        """Test that values outside the JSON data model are rejected"""
+        with pytest.raises(TypeError):
+            handler.msgpack_encode(b"raw")
+        with pytest.raises(TypeError):
+            handler.cbor_encode(object())
+
+
+class TestColumnTable:
+    """Tests for the csv/arrow column tables"""
+
+    def test_session_row_flattens_speakers(self):
+        """Test that list values are joined per column"""
+        session = handler.as_session({
+            "id": "s1", "title": "Panel", "date": "Nov 25, 2025", "stage": "CEO Stage",
+            "speakers": [
+                {"name": "Ann", "company": "A", "title": "CEO"},
+                {"name": "Bob", "company": "B"},
+            ],
+            "ecosystems": ["ai", "cloud"],
+        })
+
+        row = handler.session_row(session)
+
+        assert row[5:] == ("Ann; Bob", "A; B", "CEO; ", "ai; cloud")
+
+    def test_csv_line_quotes_when_needed(self):
+        """Test RFC 4180 quoting of separators, quotes and newlines"""
+        assert handler.csv_line(["a", "b,c", 'say "hi"', "x\ny", 3]) == 'a,"b,c","say ""hi""","x\ny",3\r\n'
+
+    def test_table_rebuilt_with_new_data(self):
+        """Test that the table is kept for the same list and rebuilt for a new one"""
+        speakers = [handler.Speaker.from_dict({"name": "Ann", "sessions": ["s1", "s2"]})]
+
+        table = handler.get_speaker_columns(speakers)
+
+        assert handler.get_speaker_columns(speakers) is table
+        assert handler.get_speaker_columns(list(speakers)) is not table
+        assert table.lines == ["Ann,,,,s1; s2,2\r\n"]
+
+
+class TestDataVersions:
+    """Tests for record_data_version and the version history"""
+
+    def test_version_follows_content(self):
+        """Test that equal content gives equal versions and any edit a new one"""
+        speakers = [handler.Speaker.from_dict({"name": "Ann", "company": "A"})]
+        edited = [handler.Speaker.from_dict({"name": "Ann", "company": "B"})]
+
+        version = handler.record_data_version("speakers", speakers)
+
+        assert handler.record_data_version("speakers", list(speakers)) == version
+        assert handler.record_data_version("speakers", edited) != version
+
+    def test_history_is_bounded(self, monkeypatch):
+        """Test that only the last DATA_HISTORY_SIZE versions are kept"""
+        monkeypatch.setattr(handler, "DATA_HISTORY_SIZE", 2)
+        versions = [
+            handler.record_data_version("speakers", [handler.Speaker.from_dict({"name": name})])
+            for name in ("Ann", "Bob", "Cid")
+        ]
+
+        assert list(handler._data_history["speakers"]) == versions[1:]
+        assert handler._data_versions["speakers"] == versions[-1]
+